@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import logging
+import math
+import numbers
 from typing import Any, Dict, List
 
 import numpy as np
@@ -86,6 +88,15 @@ AIRWAY_NORMAL_VALUES = {
     "V-LPW": (18.7, 3.7),      # 喉咽段：18.7 ± 3.7 mm
 }
 
+# 气道前后径测量的端点：(测量项, 起点, 终点)；PNS 取自 25 点 (P13)，其余取自 11 点
+AIRWAY_SEGMENTS = (
+    ("PNS-UPW", "PNS", "UPW"),
+    ("SPP-SPPW", "SPP", "SPPW"),
+    ("U-MPW", "U", "MPW"),
+    ("TB-TPPW", "TB", "TPPW"),
+    ("V-LPW", "V", "LPW"),
+)
+
 # 腺样体 A/N 比值阈值
 ADENOID_AN_THRESHOLD = 0.7  # A/N < 0.7 为正常
 
@@ -113,14 +124,16 @@ DEFAULT_SPACING_MM_PER_PIXEL = 0.1
 def _project_point_onto_line(point: np.ndarray, line_start: np.ndarray, line_end: np.ndarray) -> np.ndarray:
     """计算 point 在 line_start-line_end 直线上的投影点（垂足）。
 
+    point 可以是单点 (2,) 或多点 (N, 2)，多点时一次矩阵运算完成，返回形状与 point 相同。
     退化情况（line_start≈line_end）返回 line_start。
     """
+    shape = np.shape(point)
     vec = line_end - line_start
     denom = float(np.dot(vec, vec))
     if denom < 1e-8:
-        return line_start
-    ratio = float(np.dot(point - line_start, vec) / denom)
-    return line_start + ratio * vec
+        return np.broadcast_to(line_start, shape).copy()
+    ratio = (np.atleast_2d(point) - line_start) @ vec / denom
+    return (line_start + ratio[:, None] * vec).reshape(shape)
 
 
 THRESHOLDS = {
@@ -456,8 +469,7 @@ def _compute_ptmans_length(
     or_pt = landmarks["P3"]
     po = landmarks["P4"]
 
-    v_ptm = _project_point_onto_line(ptm, po, or_pt)
-    v_ans = _project_point_onto_line(ans, po, or_pt)
+    v_ptm, v_ans = _project_point_onto_line(np.stack((ptm, ans)), po, or_pt)
     length_px = np.linalg.norm(v_ptm - v_ans)
     length_mm = float(length_px * spacing)
 
@@ -528,8 +540,7 @@ def _compute_ptm_s(
     or_pt = landmarks["P3"]
     po = landmarks["P4"]
 
-    v_ptm = _project_point_onto_line(ptm, po, or_pt)
-    v_s = _project_point_onto_line(s, po, or_pt)
+    v_ptm, v_s = _project_point_onto_line(np.stack((ptm, s)), po, or_pt)
     length_px = np.linalg.norm(v_ptm - v_s)
     length_mm = float(length_px * spacing)
 
@@ -557,8 +568,7 @@ def _compute_pcd_s(
     or_pt = landmarks["P3"]
     po = landmarks["P4"]
 
-    v_pcd = _project_point_onto_line(pcd, po, or_pt)
-    v_s = _project_point_onto_line(s, po, or_pt)
+    v_pcd, v_s = _project_point_onto_line(np.stack((pcd, s)), po, or_pt)
     length_px = np.linalg.norm(v_pcd - v_s)
     length_mm = float(length_px * spacing)
 
@@ -1157,6 +1167,14 @@ def _is_valid_point(point: Any) -> bool:
     """判断一个点坐标是否有效（2维、非NaN）"""
     if point is None:
         return False
+    # 常见输入（长度为 2 的 list/tuple 或 shape (2,) 数组）直接做标量检查，
+    # 不再为每个点构造临时数组；其余输入走下面的通用路径，判定结果不变
+    if isinstance(point, (list, tuple)) or (isinstance(point, np.ndarray) and point.ndim == 1):
+        if len(point) != 2:
+            return False
+        x, y = point[0], point[1]
+        if isinstance(x, numbers.Real) and isinstance(y, numbers.Real):
+            return not (math.isnan(x) or math.isnan(y))
     try:
         arr = np.asarray(point, dtype=float)
         return arr.shape == (2,) and not np.isnan(arr).any()
@@ -1228,72 +1246,32 @@ def calculate_airway_measurements(
         "status": "ok",
     }
     
-    confidence_values = []
     all_normal = True
-    any_measured = False
-    
-    # 获取 25 点中的 PNS
-    pns = landmarks_25.get("P13")  # PNS - 后鼻棘
     
-    # 1. PNS-UPW: 后鼻棘点到上咽壁点的距离
-    upw = landmarks_11.get("UPW")
-    if _is_valid_point(pns) and _is_valid_point(upw):
-        dist_px = np.linalg.norm(np.array(pns) - np.array(upw))
-        dist_mm = float(dist_px * spacing)
-        result["PNS-UPW"] = round(dist_mm, 2)
-        any_measured = True
-        # 检查是否正常（正常值：28.4 ± 3.0 mm）
-        mean, std = AIRWAY_NORMAL_VALUES["PNS-UPW"]
-        if dist_mm < mean - std:
-            all_normal = False
-    
-    # 2. SPP-SPPW: 软腭后缘到咽后壁的距离
-    spp = landmarks_11.get("SPP")
-    sppw = landmarks_11.get("SPPW")
-    if _is_valid_point(spp) and _is_valid_point(sppw):
-        dist_px = np.linalg.norm(np.array(spp) - np.array(sppw))
-        dist_mm = float(dist_px * spacing)
-        result["SPP-SPPW"] = round(dist_mm, 2)
-        any_measured = True
-        mean, std = AIRWAY_NORMAL_VALUES["SPP-SPPW"]
-        if dist_mm < mean - std:
-            all_normal = False
-    
-    # 3. U-MPW: 悬雍垂尖到中咽壁的距离
-    u = landmarks_11.get("U")
-    mpw = landmarks_11.get("MPW")
-    if _is_valid_point(u) and _is_valid_point(mpw):
-        dist_px = np.linalg.norm(np.array(u) - np.array(mpw))
-        dist_mm = float(dist_px * spacing)
-        result["U-MPW"] = round(dist_mm, 2)
-        any_measured = True
-        mean, std = AIRWAY_NORMAL_VALUES["U-MPW"]
-        if dist_mm < mean - std:
-            all_normal = False
-    
-    # 4. TB-TPPW: 舌根后部到咽后壁的距离
-    tb = landmarks_11.get("TB")
-    tppw = landmarks_11.get("TPPW")
-    if _is_valid_point(tb) and _is_valid_point(tppw):
-        dist_px = np.linalg.norm(np.array(tb) - np.array(tppw))
-        dist_mm = float(dist_px * spacing)
-        result["TB-TPPW"] = round(dist_mm, 2)
-        any_measured = True
-        mean, std = AIRWAY_NORMAL_VALUES["TB-TPPW"]
-        if dist_mm < mean - std:
-            all_normal = False
-    
-    # 5. V-LPW: 会厌谷点到下咽壁的距离
-    v = landmarks_11.get("V")
-    lpw = landmarks_11.get("LPW")
-    if _is_valid_point(v) and _is_valid_point(lpw):
-        dist_px = np.linalg.norm(np.array(v) - np.array(lpw))
-        dist_mm = float(dist_px * spacing)
-        result["V-LPW"] = round(dist_mm, 2)
-        any_measured = True
-        mean, std = AIRWAY_NORMAL_VALUES["V-LPW"]
-        if dist_mm < mean - std:
-            all_normal = False
+    # 获取端点：25 点中的 PNS (P13)，其余来自 11 点
+    endpoints = {label: landmarks_11.get(label) for _, start, end in AIRWAY_SEGMENTS for label in (start, end)}
+    endpoints["PNS"] = landmarks_25.get("P13")  # PNS - 后鼻棘
+    measured = [
+        (key, endpoints[start], endpoints[end])
+        for key, start, end in AIRWAY_SEGMENTS
+        if _is_valid_point(endpoints[start]) and _is_valid_point(endpoints[end])
+    ]
+    any_measured = bool(measured)
+    
+    if measured:
+        # 所有有效的端点对一次性求欧氏距离
+        diffs = (
+            np.array([start for _, start, _ in measured], dtype=float)
+            - np.array([end for _, _, end in measured], dtype=float)
+        )
+        lengths_px = np.sqrt(np.einsum("ij,ij->i", diffs, diffs))
+        for (key, _, _), dist_px in zip(measured, lengths_px):
+            dist_mm = float(dist_px * spacing)
+            result[key] = round(dist_mm, 2)
+            # 检查是否正常（低于 均值 - 标准差 视为不足）
+            mean, std = AIRWAY_NORMAL_VALUES[key]
+            if dist_mm < mean - std:
+                all_normal = False
     
     # 计算综合结论
     if any_measured:
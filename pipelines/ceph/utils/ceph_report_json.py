@@ -4,6 +4,8 @@
 from __future__ import annotations
 
 import logging
+import math
+import numbers
 from decimal import Decimal, ROUND_HALF_UP
 from statistics import mean
 from typing import Any, Dict, List, Union
@@ -831,10 +833,9 @@ def _format_visualization(raw: Any) -> Union[Dict[str, Any], None]:
     if isinstance(virtual_points_raw, dict):
         formatted_vp = {}
         for key, value in virtual_points_raw.items():
-            arr = np.asarray(value, dtype=float)
-            if arr.shape[0] < 2 or np.isnan(arr).any():
+            if len(value) < 2 or not _is_valid_point(value):
                 continue
-            formatted_vp[key] = [round(float(arr[0]), 2), round(float(arr[1]), 2)]
+            formatted_vp[key] = [round(float(value[0]), 2), round(float(value[1]), 2)]
         if not formatted_vp:
             formatted_vp = None
 
@@ -988,5 +989,12 @@ def _visibility_grade(detected: int, total: int) -> str:
 def _is_valid_point(point: Any) -> bool:
     if point is None:
         return False
+    # 常见输入（两个实数组成的 list/tuple 或 shape (2,) 数组）逐个 math.isnan，
+    # 省去 np.isnan 的 ufunc 分派；其余输入（含 None 分量、标量、嵌套序列）走原 numpy 路径
+    if isinstance(point, (list, tuple)) or (isinstance(point, np.ndarray) and point.ndim == 1):
+        if len(point) == 2:
+            x, y = point[0], point[1]
+            if isinstance(x, numbers.Real) and isinstance(y, numbers.Real):
+                return not (math.isnan(x) or math.isnan(y))
     point_np = np.asarray(point, dtype=float)
     return not np.isnan(point_np).any()
@@ -2,15 +2,364 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import itertools
+import sys
+from types import MappingProxyType
+from typing import AbstractSet, Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, Optional, Set, Tuple
 
 import numpy as np
 
-from .ceph_report import KEYPOINT_MAP, KEYPOINT_MAP_11, KEYPOINT_MAP_34
+from .ceph_report import AIRWAY_SEGMENTS, KEYPOINT_MAP, KEYPOINT_MAP_11, KEYPOINT_MAP_34
 
 # 反向映射：短标签 -> 点位编号（P1...）
 _SHORT_KEY_TO_POINT_ID = {short: pid for pid, short in KEYPOINT_MAP.items()}
 
+# 线型/角色取值：全模块共享同一字符串对象
+_SOLID = sys.intern("Solid")
+_DASHED = sys.intern("Dashed")
+_REFERENCE = sys.intern("Reference")
+_MEASUREMENT = sys.intern("Measurement")
+
+# 规范化时遍历的 (源 key, 别名) 对，导入时一次性固化，避免循环内重复查表
+_KP25_ITEMS: Tuple[Tuple[str, str], ...] = tuple(KEYPOINT_MAP.items())
+
+# _extract_coordinates 无坐标时返回的共享只读空映射，调用方误写会直接报错而不会串到后续请求
+_EMPTY_COORDS: Mapping[str, Any] = MappingProxyType({})
+
+# 气道轮廓参与排序的点：原 11 点 + PTM + PNS
+_AIRWAY_CONTOUR_KEYS: Tuple[str, ...] = (
+    "U", "V", "UPW", "SPP", "SPPW", "MPW", "LPW", "TB", "TPPW", "AD", "D'",
+    "PTM", "PNS",
+)
+
+# 气道轮廓的全名 fallback -> 短标签；与 _AIRWAY_CONTOUR_KEYS 同名的点已在主循环中收集，不再重复
+_AIRWAY_FALLBACK_LABELS: Tuple[Tuple[str, str], ...] = tuple(
+    (name, next((k for k, v in KEYPOINT_MAP_11.items() if v == name), name))
+    for name in (
+        "Uvula tip", "Vallecula", "Upper Pharyngeal Wall", "Soft Palate Point",
+        "Soft Palate Pharyngeal Wall", "Middle Pharyngeal Wall", "Lower Pharyngeal Wall",
+        "Tongue Base", "Tongue Posterior Pharyngeal Wall", "Adenoid", "D'",
+    )
+    if name not in _AIRWAY_CONTOUR_KEYS
+)
+
+# 各测量项可视化必需的点位（短标签），缺任一点则该项不出图。
+# Airway_Gap 按已检测到的点位尽量绘制；Profile_Contour 只使用 34 点，不经过规范化
+_REQUIRED_POINTS: Dict[str, FrozenSet[str]] = {
+    "Reference_Planes": frozenset({"S", "N", "Po", "Or", "ANS", "PNS", "Go", "Me"}),
+    "ANB_Angle": frozenset({"N", "A", "B"}),
+    "SNA_Angle": frozenset({"S", "N", "A"}),
+    "SNB_Angle": frozenset({"S", "N", "B"}),
+    "PoNB_Length": frozenset({"Pog", "N", "B"}),
+    "GoPo_Length": frozenset({"Go", "Pog", "Me"}),
+    "Distance_Witsmm": frozenset({"A", "B", "U6", "L6", "U1", "L1"}),
+    "FH_MP_Angle": frozenset({"Po", "Or", "Go", "Me"}),
+    "U1_SN_Angle": frozenset({"S", "N", "U1", "U1A"}),
+    "IMPA_Angle": frozenset({"Go", "Me", "L1", "L1A"}),
+    "Jaw_Development_Coordination": frozenset({"N", "A", "B"}),
+    "SGo_NMe_Ratio": frozenset({"S", "Go", "N", "Me"}),
+    "PtmANS_Length": frozenset({"PTM", "ANS", "Po", "Or"}),
+    "Upper_Jaw_Position": frozenset({"S", "PTM", "Po", "Or"}),
+    "Pcd_Lower_Position": frozenset({"S", "Pcd", "Po", "Or"}),
+    "U1_NA_Angle": frozenset({"N", "A", "U1", "U1A"}),
+    "U1_NA_Incisor_Length": frozenset({"U1", "N", "A"}),
+    "FMIA_Angle": frozenset({"L1", "L1A", "Po", "Or"}),
+    "L1_NB_Angle": frozenset({"N", "B", "L1", "L1A"}),
+    "L1_NB_Distance": frozenset({"L1", "N", "B"}),
+    "U1_L1_Inter_Incisor_Angle": frozenset({"U1", "U1A", "L1", "L1A"}),
+    "Y_Axis_Angle": frozenset({"S", "Gn", "Or", "Po"}),
+    "Mandibular_Growth_Angle": frozenset({"Ba", "N", "Pt", "Gn"}),
+    "SN_MP_Angle": frozenset({"S", "N", "Go", "Me"}),
+    "U1_PP_Upper_Anterior_Alveolar_Height": frozenset({"U1", "ANS", "PNS"}),
+    "L1_MP_Lower_Anterior_Alveolar_Height": frozenset({"L1", "Go", "Me"}),
+    "U6_PP_Upper_Posterior_Alveolar_Height": frozenset({"U6", "ANS", "PNS"}),
+    "Profile_Contour": frozenset(),
+    "L6_MP_Lower_Posterior_Alveolar_Height": frozenset({"L6", "Go", "Me"}),
+    "Mandibular_Growth_Type_Angle": frozenset({"S", "N", "Ar", "Go", "Me"}),
+    "S_N_Anterior_Cranial_Base_Length": frozenset({"S", "N"}),
+    "Go_Me_Length": frozenset({"Go", "Me"}),
+    "Airway_Gap": frozenset(),
+    "Adenoid_Index": frozenset({"AD", "D'", "PNS", "Ba", "Ar"}),
+}
+
+# Distance_Witsmm 的固定元素（虚拟点由 _wits_payload 计算）
+_WITS_TEMPLATE: Tuple[Tuple[str, str, str, str, str], ...] = (
+    # BOP 平面参考线（虚线，从后到前）
+    ("Line", "v_molar_mid", "v_incisal_mid", _DASHED, _REFERENCE),
+    # A、B 到 BOP 的垂线
+    ("Line", "A", "v_a_on_bop", _DASHED, _MEASUREMENT),
+    ("Line", "B", "v_b_on_bop", _DASHED, _MEASUREMENT),
+    # Wits 测量段
+    ("Line", "v_a_on_bop", "v_b_on_bop", _SOLID, _MEASUREMENT),
+    ("Line", "Po", "Or", _DASHED, _REFERENCE),
+    ("Line", "A", "v_a_on_fh", _DASHED, _MEASUREMENT),
+    ("Line", "B", "v_b_on_fh", _DASHED, _MEASUREMENT),
+    # Wits 值：FH 平面上 A、B 投影点之间的水平距离
+    ("Line", "v_a_on_fh", "v_b_on_fh", _SOLID, _MEASUREMENT),
+)
+
+# 非必需但会被引用的点位（参与规范化）
+_OPTIONAL_POINTS: Dict[str, Tuple[str, ...]] = {
+    "Airway_Gap": _AIRWAY_CONTOUR_KEYS,
+}
+
+# 每个测量项会引用的全部点位（必需 + 可选），按测量项名预先合并，单张图只需求并集
+_REFERENCED_POINTS: Dict[str, FrozenSet[str]] = {
+    name: required | frozenset(_OPTIONAL_POINTS.get(name, ()))
+    for name, required in _REQUIRED_POINTS.items()
+}
+
+# 垂足类测量项：(虚拟点名, 被投影点, 直线起点, 直线终点)
+# build_visualization_map 会把所有测量项的投影合并为一次向量化计算
+_PROJECTION_SPECS: Dict[str, Tuple[Tuple[str, str, str, str], ...]] = {
+    "PoNB_Length": (("v_pog_on_nb", "Pog", "N", "B"),),
+    "GoPo_Length": (("v_pog_on_mp", "Pog", "Go", "Me"),),
+    # PtmANS_Length：PTM/ANS 在 FH(Po-Or) 上的投影
+    "PtmANS_Length": (
+        ("v_ptm_on_fh", "PTM", "Po", "Or"),
+        ("v_ans_on_fh", "ANS", "Po", "Or"),
+    ),
+    # Upper_Jaw_Position：S/PTM 在 FH(Po-Or) 上的投影
+    "Upper_Jaw_Position": (
+        ("v_s_on_fh", "S", "Po", "Or"),
+        ("v_ptm_on_fh", "PTM", "Po", "Or"),
+    ),
+    # Pcd_Lower_Position：S/Pcd 在 FH(Po-Or) 上的投影
+    "Pcd_Lower_Position": (
+        ("v_s_on_fh", "S", "Po", "Or"),
+        ("v_pcd_on_fh", "Pcd", "Po", "Or"),
+    ),
+    "U1_NA_Incisor_Length": (("v_u1_on_na", "U1", "N", "A"),),
+    "L1_NB_Distance": (("v_l1_on_nb", "L1", "N", "B"),),
+    # U1-PP / U6-PP：到 PP(ANS-PNS) 的垂足
+    "U1_PP_Upper_Anterior_Alveolar_Height": (("v_u1_on_pp", "U1", "ANS", "PNS"),),
+    "U6_PP_Upper_Posterior_Alveolar_Height": (("v_u6_on_pp", "U6", "ANS", "PNS"),),
+    # L1-MP / L6-MP：到 MP(Go-Me) 的垂足
+    "L1_MP_Lower_Anterior_Alveolar_Height": (("v_l1_on_mp", "L1", "Go", "Me"),),
+    "L6_MP_Lower_Posterior_Alveolar_Height": (("v_l6_on_mp", "L6", "Go", "Me"),),
+    # 腺样体 A 值：AD 点到 Ba-Ar 参考线的垂足
+    "Adenoid_Index": (("v_ad_on_baar", "AD", "Ba", "Ar"),),
+}
+
+# 元素结构固定的测量项模板：(Type, 点1, 点2, 点3/线型, Role)
+# Line: ("Line", From, To, Style, Role)；Angle: ("Angle", Vertex, Point1, Point2, Role)
+# 含垂足的测量项，其虚拟点由 _PROJECTION_SPECS 计算
+_STATIC_PAYLOADS: Dict[str, Tuple[Tuple[str, str, str, str, str], ...]] = {
+    # 四条参考平面（纯参考线）：SN / FH(Po-Or) / PP(ANS-PNS) / MP(Go-Me)
+    "Reference_Planes": (
+        ("Line", "S", "N", _SOLID, _REFERENCE),
+        ("Line", "Po", "Or", _SOLID, _REFERENCE),
+        ("Line", "ANS", "PNS", _SOLID, _REFERENCE),
+        ("Line", "Go", "Me", _SOLID, _REFERENCE),
+    ),
+    "SNA_Angle": (
+        ("Line", "S", "N", _SOLID, _REFERENCE),
+        ("Line", "N", "A", _SOLID, _MEASUREMENT),
+        ("Angle", "N", "S", "A", _MEASUREMENT),
+    ),
+    "SNB_Angle": (
+        ("Line", "S", "N", _SOLID, _REFERENCE),
+        ("Line", "N", "B", _SOLID, _MEASUREMENT),
+        ("Angle", "N", "S", "B", _MEASUREMENT),
+    ),
+    # ANB：仅保留 N-A 与 N-B，并增加角度圆弧
+    "ANB_Angle": (
+        ("Line", "N", "A", _SOLID, _MEASUREMENT),
+        ("Line", "N", "B", _SOLID, _MEASUREMENT),
+        ("Angle", "N", "A", "B", _MEASUREMENT),
+    ),
+    "Jaw_Development_Coordination": (
+        ("Line", "N", "A", _SOLID, _MEASUREMENT),
+        ("Line", "N", "B", _SOLID, _MEASUREMENT),
+    ),
+    "SGo_NMe_Ratio": (
+        ("Line", "S", "Go", _SOLID, _MEASUREMENT),
+        ("Line", "N", "Me", _SOLID, _MEASUREMENT),
+    ),
+    # S-N-Ar-Go-Me 折线，并标注 ∠NSAr / ∠SArGo / ∠ArGoMe
+    "Mandibular_Growth_Type_Angle": (
+        ("Line", "S", "N", _SOLID, _REFERENCE),
+        ("Line", "S", "Ar", _SOLID, _REFERENCE),
+        ("Line", "Ar", "Go", _SOLID, _REFERENCE),
+        ("Line", "Go", "Me", _SOLID, _REFERENCE),
+        ("Angle", "S", "N", "Ar", _MEASUREMENT),
+        ("Angle", "Ar", "S", "Go", _MEASUREMENT),
+        ("Angle", "Go", "Ar", "Me", _MEASUREMENT),
+    ),
+    "S_N_Anterior_Cranial_Base_Length": (
+        ("Line", "S", "N", _SOLID, _MEASUREMENT),
+    ),
+    "Go_Me_Length": (
+        ("Line", "Go", "Me", _SOLID, _MEASUREMENT),
+    ),
+    "PoNB_Length": (
+        ("Line", "N", "B", _SOLID, _REFERENCE),
+        ("Line", "Pog", "v_pog_on_nb", _DASHED, _MEASUREMENT),
+    ),
+    "GoPo_Length": (
+        ("Line", "Go", "Me", _SOLID, _REFERENCE),
+        ("Line", "Pog", "v_pog_on_mp", _DASHED, _MEASUREMENT),
+    ),
+    "PtmANS_Length": (
+        ("Line", "PTM", "v_ptm_on_fh", _DASHED, _REFERENCE),
+        ("Line", "ANS", "v_ans_on_fh", _DASHED, _REFERENCE),
+        ("Line", "v_ptm_on_fh", "v_ans_on_fh", _SOLID, _MEASUREMENT),
+    ),
+    "Upper_Jaw_Position": (
+        ("Line", "S", "v_s_on_fh", _DASHED, _REFERENCE),
+        ("Line", "PTM", "v_ptm_on_fh", _DASHED, _REFERENCE),
+        ("Line", "v_s_on_fh", "v_ptm_on_fh", _SOLID, _MEASUREMENT),
+    ),
+    "Pcd_Lower_Position": (
+        ("Line", "S", "v_s_on_fh", _DASHED, _REFERENCE),
+        ("Line", "Pcd", "v_pcd_on_fh", _DASHED, _REFERENCE),
+        ("Line", "v_s_on_fh", "v_pcd_on_fh", _SOLID, _MEASUREMENT),
+    ),
+    "U1_NA_Incisor_Length": (
+        ("Line", "N", "A", _SOLID, _REFERENCE),
+        ("Line", "U1", "v_u1_on_na", _DASHED, _MEASUREMENT),
+    ),
+    "L1_NB_Distance": (
+        ("Line", "N", "B", _SOLID, _REFERENCE),
+        ("Line", "L1", "v_l1_on_nb", _DASHED, _MEASUREMENT),
+    ),
+    "U1_PP_Upper_Anterior_Alveolar_Height": (
+        ("Line", "ANS", "PNS", _DASHED, _REFERENCE),
+        ("Line", "U1", "v_u1_on_pp", _DASHED, _MEASUREMENT),
+    ),
+    "U6_PP_Upper_Posterior_Alveolar_Height": (
+        ("Line", "ANS", "PNS", _DASHED, _REFERENCE),
+        ("Line", "U6", "v_u6_on_pp", _DASHED, _MEASUREMENT),
+    ),
+    "L1_MP_Lower_Anterior_Alveolar_Height": (
+        ("Line", "Go", "Me", _SOLID, _REFERENCE),
+        ("Line", "L1", "v_l1_on_mp", _DASHED, _MEASUREMENT),
+    ),
+    "L6_MP_Lower_Posterior_Alveolar_Height": (
+        ("Line", "Go", "Me", _SOLID, _REFERENCE),
+        ("Line", "L6", "v_l6_on_mp", _DASHED, _MEASUREMENT),
+    ),
+    # 腺样体 A/N 比值（参考《腺体气道集成与后处理说明.md》）：
+    # N 值为 PNS-D' 直线距离，A 值为 AD 到 Ba-Ar 参考线的垂距
+    "Adenoid_Index": (
+        ("Line", "PNS", "D'", _SOLID, _MEASUREMENT),
+        ("Line", "Ba", "Ar", _SOLID, _REFERENCE),
+        ("Line", "AD", "v_ad_on_baar", _DASHED, _MEASUREMENT),
+    ),
+}
+
+# 求交类测量项：(直线1起点, 直线1终点, 直线2起点, 直线2终点)，交点为虚拟点 v_int
+# build_visualization_map 会把所有测量项的求交合并为一次向量化计算
+_INTERSECTION_SPECS: Dict[str, Tuple[str, str, str, str]] = {
+    "FH_MP_Angle": ("Po", "Or", "Go", "Me"),
+    "U1_SN_Angle": ("S", "N", "U1", "U1A"),
+    "IMPA_Angle": ("Go", "Me", "L1", "L1A"),
+    "U1_NA_Angle": ("N", "A", "U1", "U1A"),
+    "FMIA_Angle": ("Po", "Or", "L1", "L1A"),
+    "L1_NB_Angle": ("N", "B", "L1", "L1A"),
+    "U1_L1_Inter_Incisor_Angle": ("U1", "U1A", "L1", "L1A"),
+    "Y_Axis_Angle": ("S", "Gn", "Po", "Or"),
+    "Mandibular_Growth_Angle": ("Ba", "N", "Pt", "Gn"),
+    "SN_MP_Angle": ("S", "N", "Go", "Me"),
+}
+
+# 求交类测量项的元素模板：(两条基础线, 交点存在时追加的延长线 + 角度圆弧)
+# 两直线平行或退化时只输出基础线
+_INTERSECTION_PAYLOADS: Dict[
+    str, Tuple[Tuple[Tuple[str, str, str, str, str], ...], Tuple[Tuple[str, str, str, str, str], ...]]
+] = {
+    # FH(Po-Or) 与 MP(Go-Me) 延长线交点
+    "FH_MP_Angle": (
+        (("Line", "Po", "Or", _DASHED, _REFERENCE), ("Line", "Go", "Me", _SOLID, _REFERENCE)),
+        (
+            ("Line", "Or", "v_int", _DASHED, _REFERENCE),
+            ("Line", "Go", "v_int", _DASHED, _REFERENCE),
+            ("Angle", "v_int", "Or", "Go", _MEASUREMENT),
+        ),
+    ),
+    # SN 与 U1-U1A 延长线交点
+    "U1_SN_Angle": (
+        (("Line", "S", "N", _SOLID, _REFERENCE), ("Line", "U1", "U1A", _SOLID, _MEASUREMENT)),
+        (
+            ("Line", "N", "v_int", _DASHED, _REFERENCE),
+            ("Line", "U1A", "v_int", _DASHED, _REFERENCE),
+            ("Angle", "v_int", "S", "U1A", _MEASUREMENT),
+        ),
+    ),
+    # MP(Go-Me) 与 L1-L1A 延长线交点
+    "IMPA_Angle": (
+        (("Line", "Go", "Me", _SOLID, _REFERENCE), ("Line", "L1", "L1A", _SOLID, _MEASUREMENT)),
+        (
+            ("Line", "Me", "v_int", _DASHED, _REFERENCE),
+            ("Line", "L1A", "v_int", _DASHED, _REFERENCE),
+            ("Angle", "v_int", "Go", "L1A", _MEASUREMENT),
+        ),
+    ),
+    # NA 与 U1-U1A 延长线交点
+    "U1_NA_Angle": (
+        (("Line", "N", "A", _SOLID, _REFERENCE), ("Line", "U1", "U1A", _SOLID, _MEASUREMENT)),
+        (
+            ("Line", "A", "v_int", _DASHED, _REFERENCE),
+            ("Line", "U1A", "v_int", _DASHED, _REFERENCE),
+            ("Angle", "v_int", "A", "U1A", _MEASUREMENT),
+        ),
+    ),
+    # FH(Po-Or) 与 L1-L1A 延长线交点
+    "FMIA_Angle": (
+        (("Line", "Po", "Or", _DASHED, _REFERENCE), ("Line", "L1", "L1A", _SOLID, _MEASUREMENT)),
+        (
+            ("Line", "Or", "v_int", _DASHED, _REFERENCE),
+            ("Line", "L1A", "v_int", _DASHED, _REFERENCE),
+            ("Angle", "v_int", "Or", "L1A", _MEASUREMENT),
+        ),
+    ),
+    # NB 与 L1 轴的夹角
+    "L1_NB_Angle": (
+        (("Line", "N", "B", _SOLID, _REFERENCE), ("Line", "L1", "L1A", _SOLID, _MEASUREMENT)),
+        (
+            ("Line", "B", "v_int", _DASHED, _REFERENCE),
+            ("Line", "L1A", "v_int", _DASHED, _REFERENCE),
+            ("Angle", "v_int", "B", "L1A", _MEASUREMENT),
+        ),
+    ),
+    # 上/下切牙轴线夹角
+    "U1_L1_Inter_Incisor_Angle": (
+        (("Line", "U1", "U1A", _SOLID, _MEASUREMENT), ("Line", "L1", "L1A", _SOLID, _MEASUREMENT)),
+        (
+            ("Line", "U1A", "v_int", _DASHED, _REFERENCE),
+            ("Line", "L1A", "v_int", _DASHED, _REFERENCE),
+            ("Angle", "v_int", "U1A", "L1A", _MEASUREMENT),
+        ),
+    ),
+    # SGn 与 FH(Po-Or) 的夹角
+    "Y_Axis_Angle": (
+        (("Line", "S", "Gn", _SOLID, _MEASUREMENT), ("Line", "Or", "Po", _DASHED, _REFERENCE)),
+        (
+            ("Line", "Gn", "v_int", _DASHED, _REFERENCE),
+            ("Line", "Or", "v_int", _DASHED, _REFERENCE),
+            ("Angle", "v_int", "Gn", "Or", _MEASUREMENT),
+        ),
+    ),
+    # BN 与 PtGn 的夹角
+    "Mandibular_Growth_Angle": (
+        (("Line", "Ba", "N", _SOLID, _REFERENCE), ("Line", "Pt", "Gn", _SOLID, _MEASUREMENT)),
+        (
+            ("Line", "N", "v_int", _DASHED, _REFERENCE),
+            ("Line", "Gn", "v_int", _DASHED, _REFERENCE),
+            ("Angle", "v_int", "N", "Gn", _MEASUREMENT),
+        ),
+    ),
+    # SN 与 MP(Go-Me) 的夹角
+    "SN_MP_Angle": (
+        (("Line", "S", "N", _SOLID, _REFERENCE), ("Line", "Go", "Me", _SOLID, _REFERENCE)),
+        (
+            ("Line", "N", "v_int", _DASHED, _REFERENCE),
+            ("Line", "Me", "v_int", _DASHED, _REFERENCE),
+            ("Angle", "v_int", "N", "Me", _MEASUREMENT),
+        ),
+    ),
+}
+
 
 def build_visualization_map(
     measurements: Dict[str, Dict[str, Any]],
@@ -22,31 +371,39 @@ def build_visualization_map(
     为所有测量项生成可视化指令。
     返回 dict[name] = VisualizationPayload | None
     """
+    # 没有 status == ok 的测量项时无需规范化点位
+    ok_names = [name for name, payload in measurements.items() if payload and payload.get("status") == "ok"]
+    if not ok_names:
+        return dict.fromkeys(measurements, None)
+
     coords25 = _extract_coordinates(landmarks_block)
-    coords11 = _extract_coordinates(landmarks_11_block) if landmarks_11_block else {}
-    coords34 = _extract_coordinates(landmarks_34_block) if landmarks_34_block else {}
+    coords11 = _extract_coordinates(landmarks_11_block)
+    coords34 = _extract_coordinates(landmarks_34_block)
     
     if not coords25 and not coords11 and not coords34:
-        return {name: None for name in measurements}
-
-    landmarks = _normalize_landmarks_all(coords25, coords11)
-    landmarks.update(coords34) # Merge 34 points directly as they use P1-P34 keys which might conflict?
-    # Wait, KEYPOINT_MAP_34 uses "P1", "P2"...
-    # KEYPOINT_MAP uses "P1" for "S".
-    # Conflict!
-    # "P1" in 34-point map is "P1".
-    # "P1" in 25-point map (if used as key) maps to "S".
-    # But `_extract_coordinates` uses the keys from `landmarks_block["coordinates"]`.
-    # In `point_model.py`, the keys are "S", "N", etc.
-    # In `point_lunkuo_34`, the keys are "P1", "P2".
-    # So `coords25` has "S", "N".
-    # `coords34` has "P1", "P2".
-    # No conflict in keys.
-    
-    viz_map: Dict[str, Optional[Dict[str, Any]]] = {}
+        return dict.fromkeys(measurements, None)
+
+    # 只规范化本次可出图的测量项实际引用到的点位
+    needed = set().union(*[_REFERENCED_POINTS[name] for name in ok_names if name in _REFERENCED_POINTS])
+    stack, index = _normalize_landmarks_soa(coords25, coords11, needed)
+    landmarks: Dict[str, Any] = {label: stack[row] for label, row in index.items()}
+    # 34 点轮廓的 key 为 P1-P34，25 点 / 11 点规范化后为短标签（S、N 等），合并时不会互相覆盖
+    landmarks.update(coords34)
 
-    for name, payload in measurements.items():
-        viz_map[name] = build_single(name, payload, landmarks)
+    # 每个可视化至少需要两个点位；检测整体失败时直接返回
+    if len(landmarks) < 2:
+        return dict.fromkeys(measurements, None)
+
+    # 所有测量项的垂足与直线交点各自一次性批量计算
+    available = frozenset(landmarks)
+    projections = _project_virtual_points(ok_names, stack, index, available)
+    intersections = _intersect_virtual_points(ok_names, stack, index, available)
+
+    # 非 ok 的测量项保持 None，只为 ok_names 构建
+    viz_map: Dict[str, Optional[Dict[str, Any]]] = dict.fromkeys(measurements, None)
+
+    for name in ok_names:
+        viz_map[name] = _build_payload(name, landmarks, projections, available, intersections)
 
     return viz_map
 
@@ -55,178 +412,64 @@ def build_single(
     name: str,
     payload: Dict[str, Any],
     landmarks: Dict[str, np.ndarray],
+    projections: Optional[Dict[str, Dict[str, np.ndarray]]] = None,
+    available: Optional[FrozenSet[str]] = None,
+    intersections: Optional[Dict[str, Optional[np.ndarray]]] = None,
 ) -> Optional[Dict[str, Any]]:
-    """针对单个测量项生成 VisualizationPayload。"""
-    if not payload or payload.get("status") != "ok":
-        return None
+    """针对单个测量项生成 VisualizationPayload。
 
-    if name == "Reference_Planes":
-        return _reference_planes_payload(landmarks)
-    if name == "ANB_Angle":
-        return _anb_payload(landmarks)
-    if name == "SNA_Angle":
-        return _sna_payload(landmarks)
-    if name == "SNB_Angle":
-        return _snb_payload(landmarks)
-    if name == "PoNB_Length":
-        return _ponb_payload(landmarks)
-    if name == "GoPo_Length":
-        return _gopo_payload(landmarks)
-    if name == "Distance_Witsmm":
-        return _wits_payload(landmarks)
-    if name == "FH_MP_Angle":
-        return _fh_mp_payload(landmarks)
-    if name == "U1_SN_Angle":
-        return _u1_sn_payload(landmarks)
-    if name == "IMPA_Angle":
-        return _impa_payload(landmarks)
-    if name == "Jaw_Development_Coordination":
-        return _jaw_coordination_payload(landmarks)
-    if name == "SGo_NMe_Ratio":
-        return _sgo_nme_payload(landmarks)
-    if name == "PtmANS_Length": 
-        return _ptm_ans_payload(landmarks)
-    if name == "Upper_Jaw_Position":
-        return _ptm_s_payload(landmarks)
-    if name == "Pcd_Lower_Position":
-        return _pcd_s_payload(landmarks)
-    if name == "U1_NA_Angle":
-        return _u1_na_angle_payload(landmarks)
-    if name == "U1_NA_Incisor_Length":
-        return _u1_na_length_payload(landmarks)
-    if name == "FMIA_Angle":
-        return _fmia_payload(landmarks)
-    if name == "L1_NB_Angle":
-        return _l1_nb_angle_payload(landmarks)
-    if name == "L1_NB_Distance":
-        return _l1_nb_distance_payload(landmarks)
-    if name == "U1_L1_Inter_Incisor_Angle":
-        return _u1_l1_angle_payload(landmarks)
-    if name == "Y_Axis_Angle":
-        return _y_axis_payload(landmarks)
-    if name == "Mandibular_Growth_Angle":
-        return _mandibular_growth_payload(landmarks)
-    if name == "SN_MP_Angle":
-        return _sn_mp_payload(landmarks)
-    if name == "U1_PP_Upper_Anterior_Alveolar_Height":
-        return _u1_pp_payload(landmarks)
-    if name == "L1_MP_Lower_Anterior_Alveolar_Height":
-        return _l1_mp_height_payload(landmarks)
-    if name == "U6_PP_Upper_Posterior_Alveolar_Height":
-        return _u6_pp_payload(landmarks)
-    if name == "Profile_Contour":
-        return _profile_contour_payload(landmarks)
-    if name == "L6_MP_Lower_Posterior_Alveolar_Height":
-        return _l6_mp_payload(landmarks)
-    if name == "Mandibular_Growth_Type_Angle":
-        return _mandibular_growth_type_payload(landmarks)
-    if name == "S_N_Anterior_Cranial_Base_Length":
-        return _sn_length_payload(landmarks)
-    if name == "Go_Me_Length":
-        return _go_me_payload(landmarks)
-    if name == "Airway_Gap":
-        return _airway_gap_payload(landmarks)
-    if name == "Adenoid_Index":
-        return _adenoid_payload(landmarks)
-
-    return None
-
-
-def _reference_planes_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
-    """绘制四条参考平面（纯参考线）。
-
-    - SN: S↔N
-    - FH: Po↔Or
-    - PP: ANS↔PNS
-    - MP: Go↔Me
-
-    统一使用 Solid + Reference。
+    projections / intersections 为 _project_virtual_points / _intersect_virtual_points
+    预先批量算好的垂足与交点；未提供时按需单独计算。
+    available 为 frozenset(landmarks)，批量调用时由上层一次性计算后传入。
     """
-    required = ["S", "N", "Po", "Or", "ANS", "PNS", "Go", "Me"]
-    if not _has_points(landmarks, required):
-        return None
-
-    elements = [
-        _line("S", "N", "Solid", "Reference"),
-        _line("Po", "Or", "Solid", "Reference"),
-        _line("ANS", "PNS", "Solid", "Reference"),
-        _line("Go", "Me", "Solid", "Reference"),
-    ]
-    return {"VirtualPoints": None, "Elements": elements}
-
-
-def _sna_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
-    required = ["S", "N", "A"]
-    if not _has_points(landmarks, required):
-        return None
-    elements = [
-        _line("S", "N", "Solid", "Reference"),
-        _line("N", "A", "Solid", "Measurement"),
-        _angle("N", "S", "A", role="Measurement"),
-    ]
-    return {"VirtualPoints": None, "Elements": elements}
-
-
-def _snb_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
-    required = ["S", "N", "B"]
-    if not _has_points(landmarks, required):
-        return None
-    elements = [
-        _line("S", "N", "Solid", "Reference"),
-        _line("N", "B", "Solid", "Measurement"),
-        _angle("N", "S", "B", role="Measurement"),
-    ]
-    return {"VirtualPoints": None, "Elements": elements}
-
-
-def _anb_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
-    """ANB：仅保留 N-A 与 N-B，并增加角度圆弧（Angle）。"""
-    required = ["N", "A", "B"]
-    if not _has_points(landmarks, required):
-        return None
-
-    elements = [
-        _line("N", "A", "Solid", "Measurement"),
-        _line("N", "B", "Solid", "Measurement"),
-        _angle("N", "A", "B", role="Measurement"),
-    ]
-    return {"VirtualPoints": None, "Elements": elements}
-
-
-def _ponb_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
-    required = ["Pog", "N", "B"]
-    if not _has_points(landmarks, required):
-        return None
-    pog, n, b = (landmarks[k] for k in required)
-    foot = _project_point_onto_line(pog, n, b)
-    foot_fmt = _format_point(foot)
-    if foot_fmt is None:
+    if not payload or payload.get("status") != "ok":
         return None
-
-    virtual_points = {"v_pog_on_nb": foot_fmt}
-    elements = [
-        _line("N", "B", "Solid", "Reference"),
-        _line("Pog", "v_pog_on_nb", "Dashed", "Measurement"),
-    ]
-    return {"VirtualPoints": virtual_points, "Elements": elements}
+    return _build_payload(name, landmarks, projections, available, intersections)
 
 
-def _gopo_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
-    required = ["Go", "Pog", "Me"]
-    if not _has_points(landmarks, required):
-        return None
-    go, pog, me = (landmarks[k] for k in required)
-    foot = _project_point_onto_line(pog, go, me)
-    foot_fmt = _format_point(foot)
-    if foot_fmt is None:
-        return None
-
-    virtual_points = {"v_pog_on_mp": foot_fmt}
-    elements = [
-        _line("Go", "Me", "Solid", "Reference"),
-        _line("Pog", "v_pog_on_mp", "Dashed", "Measurement"),
-    ]
-    return {"VirtualPoints": virtual_points, "Elements": elements}
+def _build_payload(
+    name: str,
+    landmarks: Dict[str, np.ndarray],
+    projections: Optional[Dict[str, Dict[str, np.ndarray]]] = None,
+    available: Optional[FrozenSet[str]] = None,
+    intersections: Optional[Dict[str, Optional[np.ndarray]]] = None,
+) -> Optional[Dict[str, Any]]:
+    """build_single 去掉 status 检查后的部分，调用方已确认测量项 status == ok。"""
+    required = _REQUIRED_POINTS.get(name)
+    if required is None:
+        return None
+    if available is None:
+        available = frozenset(landmarks)
+    if not _has_points(available, required):
+        return None
+
+    template = _STATIC_PAYLOADS.get(name)
+    if template is not None:
+        virtual_points = None
+        if name in _PROJECTION_SPECS:
+            if projections is None or name not in projections:
+                stack, index = _landmark_stack(landmarks, required)
+                projections = _project_virtual_points([name], stack, index, available)
+            virtual_points = {}
+            for vp_name, foot in projections[name].items():
+                foot_fmt = _format_point(foot)
+                if foot_fmt is None:
+                    return None
+                virtual_points[vp_name] = foot_fmt
+        return {"VirtualPoints": virtual_points, "Elements": list(_STATIC_ELEMENTS[name])}
+
+    if name in _INTERSECTION_SPECS:
+        if intersections is None or name not in intersections:
+            stack, index = _landmark_stack(landmarks, required)
+            intersections = _intersect_virtual_points([name], stack, index, available)
+        base, extension = _INTERSECTION_ELEMENTS[name]
+        v_int_fmt = _format_point(intersections[name])
+        if v_int_fmt is None:
+            return {"VirtualPoints": None, "Elements": list(base)}
+        return {"VirtualPoints": {"v_int": v_int_fmt}, "Elements": [*base, *extension]}
+
+    handler = _HANDLERS.get(name)
+    return handler(landmarks) if handler is not None else None
 
 
 def _wits_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
@@ -235,10 +478,6 @@ def _wits_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
     - 使用后牙中点 (U6/L6) 和 前牙中点 (U1/L1) 定义 BOP
     - 绘制 BOP 连线、A/B 垂线、A0-B0 测量段
     """
-    required = ["A", "B", "U6", "L6", "U1", "L1"]
-    if not _has_points(landmarks, required):
-        return None
-
     a = landmarks["A"]
     b = landmarks["B"]
     u6 = landmarks["U6"]
@@ -256,8 +495,7 @@ def _wits_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
         return None
 
     # A、B 向 BOP 的垂足
-    foot_a = _project_point_onto_line(a, molar_mid, incisal_mid)
-    foot_b = _project_point_onto_line(b, molar_mid, incisal_mid)
+    foot_a, foot_b = _project_two_points_onto_line(a, b, molar_mid, incisal_mid)
 
     foot_a_fmt = _format_point(foot_a)
     foot_b_fmt = _format_point(foot_b)
@@ -271,542 +509,7 @@ def _wits_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
         "v_b_on_bop": foot_b_fmt,
     }
 
-    elements = [
-
-        # BOP 平面参考线（虚线，从后到前）
-        _line("v_molar_mid", "v_incisal_mid", "Dashed", "Reference"),
-        # A、B 到 BOP 的垂线
-        _line("A", "v_a_on_bop", "Dashed", "Measurement"),
-        _line("B", "v_b_on_bop", "Dashed", "Measurement"),
-        # Wits 测量段
-        _line("v_a_on_bop", "v_b_on_bop", "Solid", "Measurement"),
-
-
-        _line("Po", "Or", "Dashed", "Reference"),
-        _line("A", "v_a_on_fh", "Dashed", "Measurement"),
-        _line("B", "v_b_on_fh", "Dashed", "Measurement"),
-        # Wits 值：FH 平面上 A、B 投影点之间的水平距离
-        _line("v_a_on_fh", "v_b_on_fh", "Solid", "Measurement"),
-
-
-    ]
-
-    return {"VirtualPoints": virtual_points, "Elements": elements}
-
-
-def _fh_mp_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
-    """FH_MP_Angle: 计算 FH(Po-Or) 与 MP(Go-Me) 延长线交点，并补充角度。"""
-    required = ["Po", "Or", "Go", "Me"]
-    if not _has_points(landmarks, required):
-        return None
-
-    po, or_pt, go, me = (landmarks[k] for k in required)
-    v_int = _get_intersection_point(po, or_pt, go, me)
-    v_int_fmt = _format_point(v_int) if v_int is not None else None
-
-    elements = [
-        _line("Po", "Or", "Dashed", "Reference"),
-        _line("Go", "Me", "Solid", "Reference"),
-    ]
-
-    if v_int_fmt:
-        virtual_points = {"v_int": v_int_fmt}
-        elements.extend([
-            _line("Or", "v_int", "Dashed", "Reference"),
-            _line("Go", "v_int", "Dashed", "Reference"),
-            _angle("v_int", "Or", "Go", role="Measurement"),
-        ])
-        return {"VirtualPoints": virtual_points, "Elements": elements}
-
-    return {"VirtualPoints": None, "Elements": elements}
-
-
-def _u1_sn_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
-    """U1_SN_Angle：计算 SN 与 U1-U1A 延长线交点，并补充延长线段 + 角度圆弧。"""
-    required = ["S", "N", "U1", "U1A"]
-    if not _has_points(landmarks, required):
-        return None
-
-    s, n, u1, u1a = (landmarks[k] for k in required)
-    v_int = _get_intersection_point(s, n, u1, u1a)
-    v_int_fmt = _format_point(v_int) if v_int is not None else None
-
-    elements = [
-        _line("S", "N", "Solid", "Reference"),
-        _line("U1", "U1A", "Solid", "Measurement"),
-    ]
-
-    if v_int_fmt is not None:
-        virtual_points = {"v_int": v_int_fmt}
-        # 延长线（用端点到交点的虚线表示）
-        elements.extend([
-            _line("N", "v_int", "Dashed", "Reference"),
-            _line("U1A", "v_int", "Dashed", "Reference"),
-            _angle("v_int", "S", "U1A", role="Measurement"),
-        ])
-        return {"VirtualPoints": virtual_points, "Elements": elements}
-
-    return {"VirtualPoints": None, "Elements": elements}
-
-
-def _impa_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
-    """IMPA_Angle：计算 MP(Go-Me) 与 L1-L1A 延长线交点，并补充延长线段 + 角度圆弧。"""
-    required = ["Go", "Me", "L1", "L1A"]
-    if not _has_points(landmarks, required):
-        return None
-
-    go, me, l1, l1a = (landmarks[k] for k in required)
-    v_int = _get_intersection_point(go, me, l1, l1a)
-    v_int_fmt = _format_point(v_int) if v_int is not None else None
-
-    elements = [
-        _line("Go", "Me", "Solid", "Reference"),
-        _line("L1", "L1A", "Solid", "Measurement"),
-    ]
-
-    if v_int_fmt is not None:
-        virtual_points = {"v_int": v_int_fmt}
-        elements.extend([
-            _line("Me", "v_int", "Dashed", "Reference"),
-            _line("L1A", "v_int", "Dashed", "Reference"),
-            _angle("v_int", "Go", "L1A", role="Measurement"),
-        ])
-        return {"VirtualPoints": virtual_points, "Elements": elements}
-
-    return {"VirtualPoints": None, "Elements": elements}
-
-
-def _jaw_coordination_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
-    required = ["N", "A", "B"]
-    if not _has_points(landmarks, required):
-        return None
-    elements = [
-        _line("N", "A", "Solid", "Measurement"),
-        _line("N", "B", "Solid", "Measurement"),
-    ]
-    return {"VirtualPoints": None, "Elements": elements}
-
-
-def _sgo_nme_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
-    required = ["S", "Go", "N", "Me"]
-    if not _has_points(landmarks, required):
-        return None
-    elements = [
-        _line("S", "Go", "Solid", "Measurement"),
-        _line("N", "Me", "Solid", "Measurement"),
-    ]
-    return {"VirtualPoints": None, "Elements": elements}
-
-
-def _ptm_ans_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
-    """PtmANS_Length：PTM/ANS 在 FH(Po-Or)上的投影距离，并画出两条垂线。"""
-    required = ["PTM", "ANS", "Po", "Or"]
-    if not _has_points(landmarks, required):
-        return None
-
-    ptm, ans, po, or_pt = (landmarks[k] for k in required)
-
-    v_ptm = _project_point_onto_line(ptm, po, or_pt)
-    v_ans = _project_point_onto_line(ans, po, or_pt)
-    v_ptm_fmt = _format_point(v_ptm)
-    v_ans_fmt = _format_point(v_ans)
-    if v_ptm_fmt is None or v_ans_fmt is None:
-        return None
-
-    virtual_points = {"v_ptm_on_fh": v_ptm_fmt, "v_ans_on_fh": v_ans_fmt}
-    elements = [
-        _line("PTM", "v_ptm_on_fh", "Dashed", "Reference"),
-        _line("ANS", "v_ans_on_fh", "Dashed", "Reference"),
-        _line("v_ptm_on_fh", "v_ans_on_fh", "Solid", "Measurement"),
-    ]
-    return {"VirtualPoints": virtual_points, "Elements": elements}
-
-
-def _ptm_s_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
-    """Upper_Jaw_Position：S/PTM 在 FH(Po-Or)上的投影距离，并画出两条垂线。"""
-    required = ["S", "PTM", "Po", "Or"]
-    if not _has_points(landmarks, required):
-        return None
-
-    s, ptm, po, or_pt = (landmarks[k] for k in required)
-
-    v_s = _project_point_onto_line(s, po, or_pt)
-    v_ptm = _project_point_onto_line(ptm, po, or_pt)
-    v_s_fmt = _format_point(v_s)
-    v_ptm_fmt = _format_point(v_ptm)
-    if v_s_fmt is None or v_ptm_fmt is None:
-        return None
-
-    virtual_points = {"v_s_on_fh": v_s_fmt, "v_ptm_on_fh": v_ptm_fmt}
-    elements = [
-        _line("S", "v_s_on_fh", "Dashed", "Reference"),
-        _line("PTM", "v_ptm_on_fh", "Dashed", "Reference"),
-        _line("v_s_on_fh", "v_ptm_on_fh", "Solid", "Measurement"),
-    ]
-    return {"VirtualPoints": virtual_points, "Elements": elements}
-
-
-def _pcd_s_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
-    """Pcd_Lower_Position：S/Pcd 在 FH(Po-Or)上的投影距离，并画出两条垂线。"""
-    required = ["S", "Pcd", "Po", "Or"]
-    if not _has_points(landmarks, required):
-        return None
-
-    s, pcd, po, or_pt = (landmarks[k] for k in required)
-
-    v_s = _project_point_onto_line(s, po, or_pt)
-    v_pcd = _project_point_onto_line(pcd, po, or_pt)
-    v_s_fmt = _format_point(v_s)
-    v_pcd_fmt = _format_point(v_pcd)
-    if v_s_fmt is None or v_pcd_fmt is None:
-        return None
-
-    virtual_points = {"v_s_on_fh": v_s_fmt, "v_pcd_on_fh": v_pcd_fmt}
-    elements = [
-        _line("S", "v_s_on_fh", "Dashed", "Reference"),
-        _line("Pcd", "v_pcd_on_fh", "Dashed", "Reference"),
-        _line("v_s_on_fh", "v_pcd_on_fh", "Solid", "Measurement"),
-    ]
-    return {"VirtualPoints": virtual_points, "Elements": elements}
-
-
-def _u1_na_angle_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
-    """U1_NA_Angle：计算 NA 与 U1-U1A 延长线交点，并补充延长线段 + 角度圆弧。"""
-    required = ["N", "A", "U1", "U1A"]
-    if not _has_points(landmarks, required):
-        return None
-
-    n, a, u1, u1a = (landmarks[k] for k in required)
-    v_int = _get_intersection_point(n, a, u1, u1a)
-    v_int_fmt = _format_point(v_int) if v_int is not None else None
-
-    elements = [
-        _line("N", "A", "Solid", "Reference"),
-        _line("U1", "U1A", "Solid", "Measurement"),
-    ]
-
-    if v_int_fmt is not None:
-        virtual_points = {"v_int": v_int_fmt}
-        elements.extend([
-            _line("A", "v_int", "Dashed", "Reference"),
-            _line("U1A", "v_int", "Dashed", "Reference"),
-            _angle("v_int", "A", "U1A", role="Measurement"),
-        ])
-        return {"VirtualPoints": virtual_points, "Elements": elements}
-
-    return {"VirtualPoints": None, "Elements": elements}
-
-
-def _u1_na_length_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
-    required = ["U1", "N", "A"]
-    if not _has_points(landmarks, required):
-        return None
-    u1, n, a = (landmarks[k] for k in required)
-    foot = _project_point_onto_line(u1, n, a)
-    foot_fmt = _format_point(foot)
-    if foot_fmt is None:
-        return None
-    virtual_points = {"v_u1_on_na": foot_fmt}
-    elements = [
-        _line("N", "A", "Solid", "Reference"),
-        _line("U1", "v_u1_on_na", "Dashed", "Measurement"),
-    ]
-    return {"VirtualPoints": virtual_points, "Elements": elements}
-
-
-def _fmia_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
-    """FMIA_Angle：计算 FH(Po-Or) 与 L1-L1A 延长线交点，并补充延长线段 + 角度圆弧。"""
-    required = ["L1", "L1A", "Po", "Or"]
-    if not _has_points(landmarks, required):
-        return None
-
-    l1, l1a, po, or_pt = (landmarks[k] for k in required)
-    v_int = _get_intersection_point(po, or_pt, l1, l1a)
-    v_int_fmt = _format_point(v_int) if v_int is not None else None
-
-    elements = [
-        _line("Po", "Or", "Dashed", "Reference"),
-        _line("L1", "L1A", "Solid", "Measurement"),
-    ]
-
-    if v_int_fmt is not None:
-        virtual_points = {"v_int": v_int_fmt}
-        elements.extend([
-            _line("Or", "v_int", "Dashed", "Reference"),
-            _line("L1A", "v_int", "Dashed", "Reference"),
-            _angle("v_int", "Or", "L1A", role="Measurement"),
-        ])
-        return {"VirtualPoints": virtual_points, "Elements": elements}
-
-    return {"VirtualPoints": None, "Elements": elements}
-
-
-def _l1_nb_angle_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
-    """L1_NB_Angle：在 NB 与 L1 轴的夹角处增加角度圆弧。"""
-    required = ["N", "B", "L1", "L1A"]
-    if not _has_points(landmarks, required):
-        return None
-
-    n, b, l1, l1a = (landmarks[k] for k in required)
-    v_int = _get_intersection_point(n, b, l1, l1a)
-    v_int_fmt = _format_point(v_int) if v_int is not None else None
-
-    elements = [
-        _line("N", "B", "Solid", "Reference"),
-        _line("L1", "L1A", "Solid", "Measurement"),
-    ]
-
-    if v_int_fmt is not None:
-        virtual_points = {"v_int": v_int_fmt}
-        elements.extend([
-            _line("B", "v_int", "Dashed", "Reference"),
-            _line("L1A", "v_int", "Dashed", "Reference"),
-            _angle("v_int", "B", "L1A", role="Measurement"),
-        ])
-        return {"VirtualPoints": virtual_points, "Elements": elements}
-
-    return {"VirtualPoints": None, "Elements": elements}
-
-
-def _l1_nb_distance_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
-    required = ["L1", "N", "B"]
-    if not _has_points(landmarks, required):
-        return None
-    l1, n, b = (landmarks[k] for k in required)
-    foot = _project_point_onto_line(l1, n, b)
-    foot_fmt = _format_point(foot)
-    if foot_fmt is None:
-        return None
-    virtual_points = {"v_l1_on_nb": foot_fmt}
-    elements = [
-        _line("N", "B", "Solid", "Reference"),
-        _line("L1", "v_l1_on_nb", "Dashed", "Measurement"),
-    ]
-    return {"VirtualPoints": virtual_points, "Elements": elements}
-
-
-def _u1_l1_angle_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
-    """U1_L1_Inter_Incisor_Angle：上/下切牙轴线夹角，增加角度圆弧。"""
-    required = ["U1", "U1A", "L1", "L1A"]
-    if not _has_points(landmarks, required):
-        return None
-
-    u1, u1a, l1, l1a = (landmarks[k] for k in required)
-    v_int = _get_intersection_point(u1, u1a, l1, l1a)
-    v_int_fmt = _format_point(v_int) if v_int is not None else None
-
-    elements = [
-        _line("U1", "U1A", "Solid", "Measurement"),
-        _line("L1", "L1A", "Solid", "Measurement"),
-    ]
-
-    if v_int_fmt is not None:
-        virtual_points = {"v_int": v_int_fmt}
-        elements.extend([
-            _line("U1A", "v_int", "Dashed", "Reference"),
-            _line("L1A", "v_int", "Dashed", "Reference"),
-            _angle("v_int", "U1A", "L1A", role="Measurement"),
-        ])
-        return {"VirtualPoints": virtual_points, "Elements": elements}
-
-    return {"VirtualPoints": None, "Elements": elements}
-
-
-def _y_axis_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
-    """Y_Axis_Angle：SGn 与 FH(Po-Or) 的夹角，增加角度圆弧。"""
-    required = ["S", "Gn", "Or", "Po"]
-    if not _has_points(landmarks, required):
-        return None
-
-    s, gn, or_pt, po = (landmarks[k] for k in required)
-    v_int = _get_intersection_point(s, gn, po, or_pt)
-    v_int_fmt = _format_point(v_int) if v_int is not None else None
-
-    elements = [
-        _line("S", "Gn", "Solid", "Measurement"),
-        _line("Or", "Po", "Dashed", "Reference"),
-    ]
-
-    if v_int_fmt is not None:
-        virtual_points = {"v_int": v_int_fmt}
-        elements.extend([
-            _line("Gn", "v_int", "Dashed", "Reference"),
-            _line("Or", "v_int", "Dashed", "Reference"),
-            _angle("v_int", "Gn", "Or", role="Measurement"),
-        ])
-        return {"VirtualPoints": virtual_points, "Elements": elements}
-
-    return {"VirtualPoints": None, "Elements": elements}
-
-
-def _mandibular_growth_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
-    """Mandibular_Growth_Angle：BN 与 PtGn 的夹角，增加角度圆弧。"""
-    required = ["Ba", "N", "Pt", "Gn"]
-    if not _has_points(landmarks, required):
-        return None
-
-    ba, n, pt, gn = (landmarks[k] for k in required)
-    v_int = _get_intersection_point(ba, n, pt, gn)
-    v_int_fmt = _format_point(v_int) if v_int is not None else None
-
-    elements = [
-        _line("Ba", "N", "Solid", "Reference"),
-        _line("Pt", "Gn", "Solid", "Measurement"),
-    ]
-
-    if v_int_fmt is not None:
-        virtual_points = {"v_int": v_int_fmt}
-        elements.extend([
-            _line("N", "v_int", "Dashed", "Reference"),
-            _line("Gn", "v_int", "Dashed", "Reference"),
-            _angle("v_int", "N", "Gn", role="Measurement"),
-        ])
-        return {"VirtualPoints": virtual_points, "Elements": elements}
-
-    return {"VirtualPoints": None, "Elements": elements}
-
-
-def _sn_mp_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
-    """SN_MP_Angle：SN 与 MP(Go-Me) 的夹角，增加角度圆弧。"""
-    required = ["S", "N", "Go", "Me"]
-    if not _has_points(landmarks, required):
-        return None
-
-    s, n, go, me = (landmarks[k] for k in required)
-    v_int = _get_intersection_point(s, n, go, me)
-    v_int_fmt = _format_point(v_int) if v_int is not None else None
-
-    elements = [
-        _line("S", "N", "Solid", "Reference"),
-        _line("Go", "Me", "Solid", "Reference"),
-    ]
-
-    if v_int_fmt is not None:
-        virtual_points = {"v_int": v_int_fmt}
-        elements.extend([
-            _line("N", "v_int", "Dashed", "Reference"),
-            _line("Me", "v_int", "Dashed", "Reference"),
-            _angle("v_int", "N", "Me", role="Measurement"),
-        ])
-        return {"VirtualPoints": virtual_points, "Elements": elements}
-
-    return {"VirtualPoints": None, "Elements": elements}
-
-
-def _u1_pp_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
-    """U1-PP：U1 到 PP(ANS-PNS) 的垂距，必须画垂线（U1->PP垂足）。"""
-    required = ["U1", "ANS", "PNS"]
-    if not _has_points(landmarks, required):
-        return None
-
-    u1, ans, pns = (landmarks[k] for k in required)
-    foot = _project_point_onto_line(u1, ans, pns)
-    foot_fmt = _format_point(foot)
-    if foot_fmt is None:
-        return None
-
-    virtual_points = {"v_u1_on_pp": foot_fmt}
-    elements = [
-        _line("ANS", "PNS", "Dashed", "Reference"),
-        _line("U1", "v_u1_on_pp", "Dashed", "Measurement"),
-    ]
-    return {"VirtualPoints": virtual_points, "Elements": elements}
-
-
-def _l1_mp_height_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
-    """L1-MP：L1 到 MP(Go-Me) 的垂距，必须画垂线。"""
-    required = ["L1", "Go", "Me"]
-    if not _has_points(landmarks, required):
-        return None
-
-    l1, go, me = (landmarks[k] for k in required)
-    foot = _project_point_onto_line(l1, go, me)
-    foot_fmt = _format_point(foot)
-    if foot_fmt is None:
-        return None
-
-    virtual_points = {"v_l1_on_mp": foot_fmt}
-    elements = [
-        _line("Go", "Me", "Solid", "Reference"),
-        _line("L1", "v_l1_on_mp", "Dashed", "Measurement"),
-    ]
-    return {"VirtualPoints": virtual_points, "Elements": elements}
-
-
-def _u6_pp_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
-    """U6-PP：U6 到 PP(ANS-PNS) 的垂距，必须画垂线。"""
-    required = ["U6", "ANS", "PNS"]
-    if not _has_points(landmarks, required):
-        return None
-
-    u6, ans, pns = (landmarks[k] for k in required)
-    foot = _project_point_onto_line(u6, ans, pns)
-    foot_fmt = _format_point(foot)
-    if foot_fmt is None:
-        return None
-
-    virtual_points = {"v_u6_on_pp": foot_fmt}
-    elements = [
-        _line("ANS", "PNS", "Dashed", "Reference"),
-        _line("U6", "v_u6_on_pp", "Dashed", "Measurement"),
-    ]
-    return {"VirtualPoints": virtual_points, "Elements": elements}
-
-
-def _l6_mp_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
-    """L6-MP：L6 到 MP(Go-Me) 的垂距，必须画垂线。"""
-    required = ["L6", "Go", "Me"]
-    if not _has_points(landmarks, required):
-        return None
-
-    l6, go, me = (landmarks[k] for k in required)
-    foot = _project_point_onto_line(l6, go, me)
-    foot_fmt = _format_point(foot)
-    if foot_fmt is None:
-        return None
-
-    virtual_points = {"v_l6_on_mp": foot_fmt}
-    elements = [
-        _line("Go", "Me", "Solid", "Reference"),
-        _line("L6", "v_l6_on_mp", "Dashed", "Measurement"),
-    ]
-    return {"VirtualPoints": virtual_points, "Elements": elements}
-
-
-def _mandibular_growth_type_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
-    """Mandibular_Growth_Type_Angle: 绘制 S-N-Ar-Go-Me 折线，并标注三个关键角度。"""
-    required = ["S", "N", "Ar", "Go", "Me"]
-    if not _has_points(landmarks, required):
-        return None
-
-    elements = [
-        # 绘制 S-N-Ar-Go-Me 折线作为参考
-        _line("S", "N", "Solid", "Reference"),
-        _line("S", "Ar", "Solid", "Reference"),
-        _line("Ar", "Go", "Solid", "Reference"),
-        _line("Go", "Me", "Solid", "Reference"),
-        # 绘制三个角度
-        _angle("S", "N", "Ar", role="Measurement"),  # ∠NSAr
-        _angle("Ar", "S", "Go", role="Measurement"),  # ∠SArGo
-        _angle("Go", "Ar", "Me", role="Measurement"),  # ∠ArGoMe
-    ]
-    return {"VirtualPoints": None, "Elements": elements}
-
-
-def _sn_length_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
-    required = ["S", "N"]
-    if not _has_points(landmarks, required):
-        return None
-    elements = [_line("S", "N", "Solid", "Measurement")]
-    return {"VirtualPoints": None, "Elements": elements}
-
-
-def _go_me_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
-    required = ["Go", "Me"]
-    if not _has_points(landmarks, required):
-        return None
-    elements = [_line("Go", "Me", "Solid", "Measurement")]
-    return {"VirtualPoints": None, "Elements": elements}
+    return {"VirtualPoints": virtual_points, "Elements": list(_WITS_ELEMENTS)}
 
 
 def _airway_gap_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
@@ -815,71 +518,40 @@ def _airway_gap_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str,
     - 几何外轮廓：使用 13 个点（原11点 + PTM + PNS）形成闭合多边形 & 连线（质心-极角排序）
     - 测量连线：PNS-UPW, SPP-SPPW, U-MPW, TB-TPPW, V-LPW
     """
-    # 原 11 点 + PTM + PNS（总 13 点参与轮廓排序）
-    keys_for_contour = [
-        "U", "V", "UPW", "SPP", "SPPW", "MPW", "LPW", "TB", "TPPW", "AD", "D'",
-        "PTM", "PNS"                  # ← 新增在这里
-    ]
-
-    # 收集参与轮廓排序的 (label, point) 对
-    labeled_points: List[tuple[str, np.ndarray]] = []
-    for label in keys_for_contour:
+    # 参与轮廓排序的点直接写入预分配的 (13 + fallback, 2) 缓冲区（原 11 点 + PTM + PNS，共 13 点）
+    fallback = [(short, landmarks[full]) for full, short in _AIRWAY_FALLBACK_LABELS if full in landmarks]
+    arr = np.empty((len(_AIRWAY_CONTOUR_KEYS) + len(fallback), 2), dtype=float)
+    labels: List[str] = []
+    for label in _AIRWAY_CONTOUR_KEYS:
         p = landmarks.get(label)
-        if isinstance(p, np.ndarray) and p.shape[0] >= 2 and not np.isnan(p).any():
-            labeled_points.append((label, p.astype(float)))
+        if p is not None:
+            arr[len(labels)] = p
+            labels.append(label)
 
-    # 兼容全名 fallback（保持原有逻辑，只针对原 11 点）
-    fallback_full_names = [
-        "Uvula tip", "Vallecula", "Upper Pharyngeal Wall", "Soft Palate Point",
-        "Soft Palate Pharyngeal Wall", "Middle Pharyngeal Wall", "Lower Pharyngeal Wall",
-        "Tongue Base", "Tongue Posterior Pharyngeal Wall", "Adenoid", "D'"
-    ]
-    for name in fallback_full_names:
-        p = landmarks.get(name)
-        if isinstance(p, np.ndarray) and p.shape[0] >= 2 and not np.isnan(p).any():
-            short_label = next((k for k, v in KEYPOINT_MAP_11.items() if v == name), name)
-            if not any(np.allclose(p, q[1]) for q in labeled_points):
-                labeled_points.append((short_label, p.astype(float)))
+    # 兼容全名 fallback（保持原有逻辑，只针对原 11 点）；与已收集点位重合的跳过
+    for short_label, p in fallback:
+        if not np.isclose(p, arr[:len(labels)]).all(axis=1).any():
+            arr[len(labels)] = p
+            labels.append(short_label)
 
     elements: List[Dict[str, Any]] = []
     polygon: Optional[List[float]] = None
 
     # === 1. 构建闭合轮廓（现在包含 PTM 和 PNS） ===
-    if len(labeled_points) >= 3:
-        points = [pt for _, pt in labeled_points]
-        labels = [lbl for lbl, _ in labeled_points]
-
-        arr = np.vstack(points)
-        centroid = np.mean(arr, axis=0)
-        angles = np.arctan2(arr[:, 1] - centroid[1], arr[:, 0] - centroid[0])
-        order = np.argsort(angles)
-
+    if len(labels) >= 3:
+        order, polygon = _ring_sort(arr[:len(labels)])
         ordered_labels = [labels[i] for i in order]
-        ordered_points = arr[order]
 
         # 生成闭合轮廓连线
         for i in range(len(ordered_labels)):
             a = ordered_labels[i]
             b = ordered_labels[(i + 1) % len(ordered_labels)]
-            elements.append(_line(a, b, "Solid", "Reference"))  # 轮廓线
-
-        # 生成 Polygon（供前端填充用，可选保留）
-        contour: List[float] = []
-        for p in ordered_points:
-            contour.extend([float(p[0]), float(p[1])])
-        polygon = contour
+            elements.append(_line(a, b, _SOLID, _REFERENCE))  # 轮廓线
 
     # === 2. 核心测量前后径连线 ===
-    airway_pairs = [
-        ("PNS", "UPW"),
-        ("SPP", "SPPW"),
-        ("U", "MPW"),
-        ("TB", "TPPW"),
-        ("V", "LPW"),
-    ]
-    for a, b in airway_pairs:
-        if _has_points(landmarks, [a, b]):
-            elements.append(_line(a, b, "Solid", "Measurement"))  # 建议用 Solid 更突出
+    for a, b, element in _AIRWAY_MEASUREMENT_ELEMENTS:
+        if a in landmarks and b in landmarks:
+            elements.append(element)
 
     # 若没有任何可视化元素，则返回 None
     if not elements and polygon is None:
@@ -892,64 +564,44 @@ def _airway_gap_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str,
     }
 
 
-def _adenoid_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
-    """腺样体 A/N 比值几何可视化。
-
-    参考文档《腺体气道集成与后处理说明.md》：
-    - N 值：PNS-D' 的直线距离
-    - A 值：AD 点到 Ba-Ar 参考线的垂直距离
-    """
-    # 需要同时获取：AD, D'（11点）以及 PNS, Ba, Ar（25点）
-    required = ["AD", "D'", "PNS", "Ba", "Ar"]
-    if not _has_points(landmarks, required):
-        return None
-
-    ad, _dprime, _pns, ba, ar = (landmarks[k] for k in required)
-
-    # 计算 AD 点到 Ba-Ar 直线的垂足
-    foot = _project_point_onto_line(ad, ba, ar)
-    foot_fmt = _format_point(foot)
-    if foot_fmt is None:
-        return None
-
-    virtual_points = {"v_ad_on_baar": foot_fmt}
-    elements = [
-        _line("PNS", "D'", "Solid", "Measurement"),         # N 值：PNS-D'
-        _line("Ba", "Ar", "Solid", "Reference"),            # 参考线：Ba-Ar
-        _line("AD", "v_ad_on_baar", "Dashed", "Measurement"),  # A 值：AD 到 Ba-Ar 垂足
-    ]
-    return {"VirtualPoints": virtual_points, "Elements": elements}
-
-
 def _profile_contour_payload(landmarks: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
     """34点侧貌轮廓连线可视化。
     
     按顺序连接 P1 -> P2 -> ... -> P34
     """
-    elements = []
-    
-    # 遍历 P1 到 P33，连接到下一个点
-    for i in range(1, 34):
-        raw_curr = f"P{i}"
-        raw_next = f"P{i+1}"
-        
-        # 只有当两个点都存在时才连接
-        if raw_curr in landmarks and raw_next in landmarks:
-            # 映射到输出标签（与 JSON 中的 Landmarks 标签一致）
-            label_curr = KEYPOINT_MAP_34.get(raw_curr, raw_curr)
-            label_next = KEYPOINT_MAP_34.get(raw_next, raw_next)
-            elements.append(_line(label_curr, label_next, "Solid", "Reference"))
-            
+    # 只有当相邻两个点都存在时才连接；连线元素在加载时已生成
+    elements = [
+        element
+        for raw_curr, raw_next, element in _PROFILE_CONTOUR_ELEMENTS
+        if raw_curr in landmarks and raw_next in landmarks
+    ]
+
     if not elements:
         return None
         
     return {"VirtualPoints": None, "Elements": elements}
 
 
+# 需要单独计算（交点 / 中点 / 轮廓）的测量项构建函数
+_HANDLERS: Dict[str, Callable[[Dict[str, np.ndarray]], Optional[Dict[str, Any]]]] = {
+    "Distance_Witsmm": _wits_payload,
+    "Profile_Contour": _profile_contour_payload,
+    "Airway_Gap": _airway_gap_payload,
+}
+
+
 def _line(from_label: str, to_label: str, style: str, role: str) -> Dict[str, str]:
     return {"Type": "Line", "From": from_label, "To": to_label, "Style": style, "Role": role}
 
 
+def _element(spec: Tuple[str, str, str, str, str]) -> Dict[str, str]:
+    """按 _STATIC_PAYLOADS 中的模板元组生成 Line / Angle 元素。"""
+    kind, a, b, c, role = spec
+    if kind == "Angle":
+        return _angle(a, b, c, role=role)
+    return _line(a, b, c, role)
+
+
 def _angle(vertex: str, point1: str, point2: str, role: str) -> Dict[str, str]:
     """角度可视化元素。
 
@@ -960,105 +612,262 @@ def _angle(vertex: str, point1: str, point2: str, role: str) -> Dict[str, str]:
     return {"Type": "Angle", "Vertex": vertex, "Point1": point1, "Point2": point2, "Role": role}
 
 
-def _get_intersection_point(
+# 模板元素在加载时一次性展开为 dict；下游 _format_visualization 只读取不修改，
+# 每次调用只需复制外层 list
+_STATIC_ELEMENTS: Dict[str, Tuple[Dict[str, str], ...]] = {
+    name: tuple(_element(spec) for spec in template) for name, template in _STATIC_PAYLOADS.items()
+}
+_WITS_ELEMENTS: Tuple[Dict[str, str], ...] = tuple(_element(spec) for spec in _WITS_TEMPLATE)
+# 气道核心测量前后径连线（两端点均检测到时绘制，用 Solid 更突出），与测量端点一致
+_AIRWAY_MEASUREMENT_ELEMENTS: Tuple[Tuple[str, str, Dict[str, str]], ...] = tuple(
+    (a, b, _line(a, b, _SOLID, _MEASUREMENT)) for _, a, b in AIRWAY_SEGMENTS
+)
+# 侧貌轮廓 P1 -> P2 -> ... -> P34 的相邻连线，标签映射到输出标签（与 JSON 中的 Landmarks 标签一致）
+_PROFILE_CONTOUR_ELEMENTS: Tuple[Tuple[str, str, Dict[str, str]], ...] = tuple(
+    (
+        f"P{i}",
+        f"P{i + 1}",
+        _line(KEYPOINT_MAP_34.get(f"P{i}", f"P{i}"), KEYPOINT_MAP_34.get(f"P{i + 1}", f"P{i + 1}"), _SOLID, _REFERENCE),
+    )
+    for i in range(1, 34)
+)
+_INTERSECTION_ELEMENTS: Dict[str, Tuple[Tuple[Dict[str, str], ...], Tuple[Dict[str, str], ...]]] = {
+    name: (tuple(_element(spec) for spec in base), tuple(_element(spec) for spec in extension))
+    for name, (base, extension) in _INTERSECTION_PAYLOADS.items()
+}
+
+
+def _ring_sort(arr: np.ndarray) -> Tuple[np.ndarray, List[float]]:
+    """按质心极角排序 (n, 2) 点集，返回 (排序下标, 扁平化的 [x0, y0, x1, y1, ...] 轮廓)。"""
+    n = arr.shape[0]
+    cx = arr[:, 0].sum() / n
+    cy = arr[:, 1].sum() / n
+    order = np.argsort(np.arctan2(arr[:, 1] - cy, arr[:, 0] - cx))
+    return order, arr[order].ravel().tolist()
+
+
+def _intersect_virtual_points(
+    names: Iterable[str],
+    stack: np.ndarray,
+    index: Dict[str, int],
+    available: FrozenSet[str],
+) -> Dict[str, Optional[np.ndarray]]:
+    """按 _INTERSECTION_SPECS 收集各测量项的直线求交，一次向量化完成。
+
+    返回 dict[测量项] = 交点；两直线平行或退化时为 None，缺点位的测量项不出现在结果中。
+    """
+    owners: List[str] = []
+    rows: List[Tuple[int, ...]] = []
+    for name in names:
+        spec = _INTERSECTION_SPECS.get(name)
+        if spec is None or not _has_points(available, _REQUIRED_POINTS[name]):
+            continue
+        owners.append(name)
+        rows.append(tuple(index[label] for label in spec))
+
+    if not rows:
+        return {}
+
+    quads = stack[np.array(rows, dtype=np.intp)]  # (K, 4, 2)
+    points, parallel = _intersect_lines(quads[:, 0], quads[:, 1], quads[:, 2], quads[:, 3])
+    return {
+        name: None if is_parallel else point
+        for name, point, is_parallel in zip(owners, points, parallel)
+    }
+
+
+def _intersect_lines(
     p1: np.ndarray,
     p2: np.ndarray,
     p3: np.ndarray,
     p4: np.ndarray,
-) -> Optional[np.ndarray]:
-    """计算直线 p1-p2 与 p3-p4 的交点。
+) -> Tuple[np.ndarray, np.ndarray]:
+    """批量计算直线 p1-p2 与 p3-p4 的交点，输入均为 (K, 2)。
 
-    返回：
-        - np.ndarray(shape=(2,)) 交点
-        - None：两直线平行或退化
+    返回 (交点 (K, 2), 平行/退化掩码 (K,))；掩码为 True 的行交点无意义。
 
     注：这里按“无限延长线”求交点（不是线段相交）。
     """
-    p1 = np.asarray(p1, dtype=float)
-    p2 = np.asarray(p2, dtype=float)
-    p3 = np.asarray(p3, dtype=float)
-    p4 = np.asarray(p4, dtype=float)
-
     d1 = p2 - p1
     d2 = p4 - p3
+    denom = d1[:, 0] * d2[:, 1] - d1[:, 1] * d2[:, 0]
+    parallel = np.abs(denom) < 1e-8
+    w = p3 - p1
+    t = (w[:, 0] * d2[:, 1] - w[:, 1] * d2[:, 0]) / np.where(parallel, 1.0, denom)
+    return p1 + t[:, None] * d1, parallel
+
+
+def _project_virtual_points(
+    names: Iterable[str],
+    stack: np.ndarray,
+    index: Dict[str, int],
+    available: FrozenSet[str],
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """按 _PROJECTION_SPECS 收集各测量项的垂足计算，一次向量化完成。
+
+    stack / index 为 _normalize_landmarks_soa 的输出，点位按整数行号从 stack 中取出。
+    返回 dict[测量项][虚拟点名] = 垂足；缺点位的测量项不出现在结果中。
+    """
+    owners: List[Tuple[str, str]] = []
+    rows: List[Tuple[int, int, int]] = []
+    for name in names:
+        specs = _PROJECTION_SPECS.get(name)
+        if not specs or not _has_points(available, _REQUIRED_POINTS[name]):
+            continue
+        for vp_name, point, start, end in specs:
+            owners.append((name, vp_name))
+            rows.append((index[point], index[start], index[end]))
 
-    denom = float(np.cross(d1, d2))
-    if abs(denom) < 1e-8:
-        return None
+    result: Dict[str, Dict[str, np.ndarray]] = {}
+    if not rows:
+        return result
 
-    t = float(np.cross(p3 - p1, d2) / denom)
-    return p1 + t * d1
+    stacked = stack[np.array(rows, dtype=np.intp)]  # (K, 3, 2)
+    feet = _project_points_onto_lines(stacked[:, 0], stacked[:, 1], stacked[:, 2])
+    for (name, vp_name), foot in zip(owners, feet):
+        result.setdefault(name, {})[vp_name] = foot
+    return result
 
 
-def _project_point_onto_line(point: np.ndarray, line_start: np.ndarray, line_end: np.ndarray) -> np.ndarray:
-    """计算 point 在 line_start-line_end 直线上的投影点（垂足）。
+def _project_points_onto_lines(points: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """批量垂足：points/starts/ends 均为 (K, 2)，返回 (K, 2)。
 
-    退化情况（line_start≈line_end）返回 line_start。
+    退化直线（start≈end）的垂足取 start。
     """
-    vec = line_end - line_start
-    denom = float(np.dot(vec, vec))
+    vec = ends - starts
+    denom = np.einsum("ij,ij->i", vec, vec)
+    degenerate = denom < 1e-8
+    ratio = np.einsum("ij,ij->i", points - starts, vec) / np.where(degenerate, 1.0, denom)
+    ratio[degenerate] = 0.0
+    return starts + ratio[:, None] * vec
+
+
+def _project_two_points_onto_line(
+    p1: np.ndarray,
+    p2: np.ndarray,
+    line_start: np.ndarray,
+    line_end: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """两点投影到同一直线，方向向量与分母倒数只算一次；退化情况两者均返回 line_start。"""
+    ax, ay = float(line_start[0]), float(line_start[1])
+    vx = float(line_end[0]) - ax
+    vy = float(line_end[1]) - ay
+    denom = vx * vx + vy * vy
     if denom < 1e-8:
-        return line_start
-    ratio = float(np.dot(point - line_start, vec) / denom)
-    return line_start + ratio * vec
+        return np.array((ax, ay), dtype=float), np.array((ax, ay), dtype=float)
+    inv_denom = 1.0 / denom
+    r1 = ((float(p1[0]) - ax) * vx + (float(p1[1]) - ay) * vy) * inv_denom
+    r2 = ((float(p2[0]) - ax) * vx + (float(p2[1]) - ay) * vy) * inv_denom
+    return (
+        np.array((ax + r1 * vx, ay + r1 * vy), dtype=float),
+        np.array((ax + r2 * vx, ay + r2 * vy), dtype=float),
+    )
 
 
 def _format_point(pt: Optional[np.ndarray]) -> Optional[List[float]]:
     if pt is None:
         return None
-    arr = np.asarray(pt, dtype=float)
-    if arr.shape[0] < 2 or np.isnan(arr).any():
+    # 上游保证 pt 为 2 维浮点向量；x != x 即 NaN
+    x = float(pt[0])
+    y = float(pt[1])
+    if x != x or y != y:
         return None
-    return [round(float(arr[0]), 2), round(float(arr[1]), 2)]
+    return [round(x, 2), round(y, 2)]
 
 
-def _has_points(landmarks: Dict[str, np.ndarray], labels: List[str]) -> bool:
-    return all(label in landmarks for label in labels)
+def _has_points(available: AbstractSet[str], required: FrozenSet[str]) -> bool:
+    """available 为已有点位集合（通常是 frozenset(landmarks)）。"""
+    return required <= available
 
 
 def _normalize_landmarks(coordinates: Dict[str, Any]) -> Dict[str, np.ndarray]:
     """仅规范化25点：P-id -> 短标签。保留旧用法。"""
-    normalized: Dict[str, np.ndarray] = {}
-    for pid, point in coordinates.items():
-        if pid not in KEYPOINT_MAP:
-            continue
-        alias = KEYPOINT_MAP[pid]
-        arr = np.asarray(point, dtype=float)
-        if arr.shape[0] < 2 or np.isnan(arr).any():
-            continue
-        normalized[alias] = arr
-    return normalized
+    return _normalize_landmarks_all(coordinates, {})
 
 
-def _normalize_landmarks_all(coords25: Dict[str, Any], coords11: Dict[str, Any]) -> Dict[str, np.ndarray]:
-    """合并规范化：25点(P-id->短标签) + 11点(直接key即短标签)。"""
-    normalized: Dict[str, np.ndarray] = {}
+def _normalize_landmarks_all(
+    coords25: Dict[str, Any],
+    coords11: Dict[str, Any],
+    needed: Optional[Set[str]] = None,
+) -> Dict[str, np.ndarray]:
+    """合并规范化：25点(P-id->短标签) + 11点(直接key即短标签)。
+
+    needed 给定时只处理其中的短标签，未被引用的点位不做转换与 NaN 检查。
+
+    约定：返回值中只包含 shape 为 (2,)、不含 NaN 的 float64 数组，
+    下游构建函数只需判断 key 是否存在 / get 是否为 None。
+    """
+    stack, index = _normalize_landmarks_soa(coords25, coords11, needed)
+    return {label: stack[row] for label, row in index.items()}
+
+
+def _normalize_landmarks_soa(
+    coords25: Dict[str, Any],
+    coords11: Dict[str, Any],
+    needed: Optional[Set[str]] = None,
+) -> Tuple[np.ndarray, Dict[str, int]]:
+    """_normalize_landmarks_all 的数组形式：返回 (stack, index)。
+
+    stack 为 (M, 2) 连续 float64 数组，只含有效点位；index 为 短标签 -> 行号。
+    """
+    coords25 = coords25 or _EMPTY_COORDS
+    coords11 = coords11 or _EMPTY_COORDS
+    if needed is None:
+        items25: Iterable[Tuple[str, str]] = _KP25_ITEMS
+        keys11: Iterable[str] = KEYPOINT_MAP_11
+    else:
+        items25 = [(_SHORT_KEY_TO_POINT_ID[a], a) for a in needed if a in _SHORT_KEY_TO_POINT_ID]
+        keys11 = [k for k in needed if k in KEYPOINT_MAP_11]
+
+    # 先收集候选点及其短标签，再一次性转换为 (N, 2) 数组
+    labels: List[str] = []
+    points: List[Any] = []
     # 25点
-    for pid, point in (coords25 or {}).items():
-        if pid in KEYPOINT_MAP:
-            alias = KEYPOINT_MAP[pid]
-            arr = np.asarray(point, dtype=float)
-            if arr.shape[0] >= 2 and not np.isnan(arr).any():
-                normalized[alias] = arr
-    # 11点
-    for key, point in (coords11 or {}).items():
-        # key 与 KEYPOINT_MAP_11 的键一致（U, V, ...）
-        if key in KEYPOINT_MAP_11:
-            arr = np.asarray(point, dtype=float)
-            if arr.shape[0] >= 2 and not np.isnan(arr).any():
-                normalized[key] = arr
-            # 同时支持映射到人类可读的短标签别名（不必，但以防前端使用全名）
-            alias_full = KEYPOINT_MAP_11[key]
-            normalized[alias_full] = arr
-    return normalized
-
-
-def _extract_coordinates(landmarks_block: Dict[str, Any]) -> Dict[str, Any]:
-    """支持两种输入：{'coordinates': {...}} 或直接传坐标 dict。"""
+    for pid, alias in items25:
+        point = coords25.get(pid)
+        if point is not None and len(point) == 2:
+            labels.append(alias)
+            points.append(point)
+    # 11点：key 即短标签（U, V, ...），KEYPOINT_MAP_11 为恒等映射，只写一次
+    for key in keys11:
+        point = coords11.get(key)
+        if point is not None and len(point) == 2:
+            labels.append(key)
+            points.append(point)
+
+    if not points:
+        return np.empty((0, 2), dtype=np.float64), {}
+
+    # 保持 float64：像素坐标上千，float32 只有约 1e-4 的分辨率，
+    # 经投影/求交后会改变保留两位小数的输出；数组仅几十个点，带宽不是瓶颈
+    arr = np.fromiter(
+        itertools.chain.from_iterable(points), dtype=np.float64, count=2 * len(points)
+    ).reshape(-1, 2)
+    valid = ~np.isnan(arr).any(axis=1)
+    index = {label: row for row, label in enumerate(itertools.compress(labels, valid))}
+    # 布尔索引返回新的连续数组，行号与 index 一致
+    return arr[valid], index
+
+
+def _landmark_stack(
+    landmarks: Dict[str, Any],
+    labels: Iterable[str],
+) -> Tuple[np.ndarray, Dict[str, int]]:
+    """从已规范化的 landmarks 中取出 labels 组成 (stack, index)，供单项调用时使用。"""
+    labels = tuple(labels)
+    stack = np.array([landmarks[label] for label in labels], dtype=np.float64).reshape(-1, 2)
+    return stack, {label: row for row, label in enumerate(labels)}
+
+
+def _extract_coordinates(landmarks_block: Optional[Dict[str, Any]]) -> Mapping[str, Any]:
+    """支持两种输入：{'coordinates': {...}} 或直接传坐标 dict。
+
+    无坐标时返回共享的只读 _EMPTY_COORDS。
+    """
     if not isinstance(landmarks_block, dict):
-        return {}
-    if "coordinates" in landmarks_block:
-        coords = landmarks_block.get("coordinates") or {}
-        return coords if isinstance(coords, dict) else {}
-    return landmarks_block
+        return _EMPTY_COORDS
+    if "coordinates" not in landmarks_block:
+        return landmarks_block
+    coords = landmarks_block["coordinates"]
+    return coords if isinstance(coords, dict) else _EMPTY_COORDS
 
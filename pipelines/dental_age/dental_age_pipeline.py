@@ -8,16 +8,17 @@ from pipelines.base_pipeline import BasePipeline
 from pipelines.pano.modules.teeth_seg import TeethSegmentationModule
 from PIL import Image
 import logging
+import sys
 
 logger = logging.getLogger(__name__)
 
-# 乳牙 FDI 编码（国际牙科联盟标准）
-DECIDUOUS_TEETH_FDI = [
+# 乳牙 FDI 编码（国际牙科联盟标准）；只做成员判断，用 frozenset 做 O(1) 查找
+DECIDUOUS_TEETH_FDI = frozenset([
     "51", "52", "53", "54", "55",  # 上颌右侧乳牙
     "61", "62", "63", "64", "65",  # 上颌左侧乳牙
     "71", "72", "73", "74", "75",  # 下颌左侧乳牙
     "81", "82", "83", "84", "85"   # 下颌右侧乳牙
-]
+])
 
 
 class DentalAgePipeline(BasePipeline):
@@ -119,17 +120,12 @@ class DentalAgePipeline(BasePipeline):
         logger.info(f"Detected {len(class_names)} teeth: {class_names}")
         
         # 3. 分析牙齿类型（乳牙 vs 恒牙）
-        deciduous_teeth = []
-        permanent_teeth = []
-        
-        for cls_name in class_names:
-            # 牙齿类名格式：'tooth-11', 'tooth-52', etc.
-            fdi = cls_name.split('-')[-1]  # 提取 FDI 编码
-            
-            if fdi in DECIDUOUS_TEETH_FDI:
-                deciduous_teeth.append(fdi)
-            else:
-                permanent_teeth.append(fdi)
+        # 牙齿类名格式：'tooth-11', 'tooth-52', etc.，取最后一段为 FDI 编码；
+        # FDI 编码只有几十种，驻留后各次请求共享同一字符串对象，集合查找先按指针比较
+        # 先整体排序一次，按序划分后的两个列表自然有序，返回时无需再分别排序
+        fdis = sorted(sys.intern(cls_name.rsplit('-', 1)[-1]) for cls_name in class_names)
+        deciduous_teeth = [fdi for fdi in fdis if fdi in DECIDUOUS_TEETH_FDI]
+        permanent_teeth = [fdi for fdi in fdis if fdi not in DECIDUOUS_TEETH_FDI]
         
         # 4. 判断牙列类型
         has_deciduous = len(deciduous_teeth) > 0
@@ -147,8 +143,8 @@ class DentalAgePipeline(BasePipeline):
                 "totalDetected": len(class_names),
                 "deciduousCount": len(deciduous_teeth),
                 "permanentCount": len(permanent_teeth),
-                "deciduousTeeth": sorted(deciduous_teeth),
-                "permanentTeeth": sorted(permanent_teeth)
+                "deciduousTeeth": deciduous_teeth,
+                "permanentTeeth": permanent_teeth
             }
         }
 
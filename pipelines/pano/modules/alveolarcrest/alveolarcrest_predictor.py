@@ -44,6 +44,7 @@ class AlveolarCrestSegmentationModule:
             retina_masks: bool = True,
             agnostic_nms: bool = True,
             max_det: int = 1,
+            half: bool = False,
     ):
         """
         初始化牙槽骨分割模块
@@ -58,6 +59,7 @@ class AlveolarCrestSegmentationModule:
             retina_masks: 是否使用高分辨率 mask（更平滑的边缘）
             agnostic_nms: 是否使用类无关 NMS
             max_det: 最大检测数量（默认1，确保只输出最强的一个）
+            half: 是否使用 FP16 推理（仅 GPU 生效，CPU 上忽略）
         """
         self.weights_key = weights_key
         self.weights_force_download = weights_force_download
@@ -78,6 +80,9 @@ class AlveolarCrestSegmentationModule:
             # "0", "1" 等数字字符串表示 GPU 索引
             self.device = f'cuda:{device}' if torch.cuda.is_available() else 'cpu'
 
+        # FP16 只在 CUDA 上有意义，CPU 推理保持 FP32
+        self.half = half and self.device.startswith('cuda')
+
         self.weights_path = self._resolve_weights_path()
         self.model = self._load_model()
 
@@ -177,6 +182,7 @@ class AlveolarCrestSegmentationModule:
                     device=self.device,
                     retina_masks=self.retina_masks,
                     agnostic_nms=self.agnostic_nms,
+                    half=self.half,
                     verbose=False,
                     save=False,
                 )
@@ -188,22 +194,22 @@ class AlveolarCrestSegmentationModule:
 
             # 结果提取（Post-processing）
             with timer.record("alveolarcrest_seg.post"):
-                # 提取 masks（YOLO的masks已经是原始图像尺寸）
-                masks = results[0].masks.data.cpu().numpy() if results[0].masks is not None else np.array([])
+                result = results[0]
+                masks_obj = result.masks
 
-                if len(masks) == 0:
+                # 提取 masks（YOLO的masks已经是原始图像尺寸）
+                if masks_obj is None or len(masks_obj.data) == 0:
                     logger.warning("No alveolar crest mask detected.")
                     return {"mask": None, "contour": [], "confidence": 0.0, "bbox": [], "exists": False,
                             "original_shape": original_shape}
 
-                # 只取第一个 mask（模型输出只有一个类别）
-                mask = masks[0]  # [H, W]
+                # 只取第一个 mask（模型输出只有一个类别），在设备上二值化为 uint8 后只把这一张拷回 CPU，
+                # 拷贝字节数为 float32 的 1/4，轮廓降级方案也无需再转换类型
+                mask = masks_obj.data[0].gt(0.5).to(torch.uint8).cpu().numpy()  # [H, W]
 
                 # 提取轮廓坐标
                 contour = []
-                segments = None
-                masks_obj = results[0].masks
-                if masks_obj is not None and getattr(masks_obj, "xy", None) is not None:
+                if getattr(masks_obj, "xy", None) is not None:
                     xy_data = masks_obj.xy
                     if len(xy_data) > 0:
                         try:
@@ -223,18 +229,19 @@ class AlveolarCrestSegmentationModule:
                 if contour and len(contour) >= 3:
                     contour = smooth_contour_by_preset(contour, "alveolarcrest")
 
-                # 提取置信度
-                confidences = results[0].boxes.conf.cpu().numpy() if results[0].boxes is not None else np.array([])
-                confidence = float(confidences[0]) if len(confidences) > 0 else 0.0
-
-                # 提取 bbox
-                boxes = results[0].boxes.xywh.cpu().numpy() if results[0].boxes is not None else np.array([])
-                bbox = boxes[0].tolist() if len(boxes) > 0 else []
+                # 提取置信度与 bbox：第一个框的 [conf, x, y, w, h] 在设备上拼接后一次拷回 CPU
+                boxes = result.boxes
+                confidence = 0.0
+                bbox = []
+                if boxes is not None and len(boxes.conf) > 0:
+                    conf_box = torch.cat((boxes.conf[:1, None], boxes.xywh[:1]), dim=1)[0].cpu().numpy()
+                    confidence = float(conf_box[0])
+                    bbox = conf_box[1:].tolist()
 
                 logger.info(f"Alveolar crest detected with confidence: {confidence:.2f}")
 
             return {
-                "mask": mask,  # [H, W] binary mask (原始图像尺寸)
+                "mask": mask,  # [H, W] uint8 binary mask (原始图像尺寸)
                 "contour": contour,  # [[x, y], ...] 轮廓坐标（原始图像坐标）
                 "confidence": confidence,  # 置信度
                 "bbox": bbox,  # [x, y, w, h]
@@ -259,9 +266,10 @@ class AlveolarCrestSegmentationModule:
         import cv2
 
         try:
-            # 确保 mask 是二值化的 uint8 格式
+            # 确保 mask 是二值化的 uint8 格式（比较结果直接写入 uint8 缓冲区，省去 bool 临时数组）
             if mask.dtype != np.uint8:
-                binary_mask = (mask > 0.5).astype(np.uint8)
+                binary_mask = np.empty(mask.shape, dtype=np.uint8)
+                np.greater(mask, 0.5, out=binary_mask, casting="unsafe")
             else:
                 binary_mask = mask
 
@@ -276,11 +284,8 @@ class AlveolarCrestSegmentationModule:
                 # 取最大轮廓
                 largest_contour = max(contours, key=cv2.contourArea)
                 # 转换为标准格式 [[x, y], ...]
-                coords = largest_contour.squeeze()
-                if coords.ndim == 1:
-                    result = [[float(coords[0]), float(coords[1])]]
-                else:
-                    result = [[float(pt[0]), float(pt[1])] for pt in coords]
+                coords = largest_contour.reshape(-1, 2).astype(float)
+                result = coords.tolist()
                 
                 # [NEW] 应用平滑处理（迁移自前端，替代原有的 approxPolyDP）
                 # 使用 standard 模式：RDP抽稀 + Chaikin平滑
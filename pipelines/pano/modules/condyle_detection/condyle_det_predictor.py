@@ -87,6 +87,7 @@ class JointPredictor:
         weights_key: Optional[str] = None,
         weights_force_download: bool = False,
         device: Optional[str] = None,
+        half: bool = False,
     ):
         """
         初始化髁突检测模块
@@ -95,6 +96,7 @@ class JointPredictor:
             weights_key: S3 权重路径（从 config.yaml 传入）
             weights_force_download: 是否强制重新下载权重
             device: 推理设备（"0", "cpu" 等）
+            half: 是否使用 FP16 推理（仅 GPU 生效，CPU 上忽略）
         """
         self.weights_key = weights_key
         self.weights_force_download = weights_force_download
@@ -109,8 +111,13 @@ class JointPredictor:
             # "0", "1" 等数字字符串表示 GPU 索引
             self.device = f'cuda:{device}' if torch.cuda.is_available() else 'cpu'
 
+        # FP16 只在 CUDA 上有意义，CPU 推理保持 FP32
+        self.half = half and self.device.startswith('cuda')
+
         self.weights_path = None
         self.model = None
+        # 类别 id -> (类名, 形态学分类)，模型加载后按 model.names 生成
+        self._class_info = {}
         self._init_model()
 
     def _resolve_weights_path(self) -> str:
@@ -166,6 +173,11 @@ class JointPredictor:
             logger.info(f"Loading YOLO weights from: {self.weights_path}")
             logger.info(f"CUDA available: {torch.cuda.is_available()}, Target device: {self.device}")
             self.model = YOLO(self.weights_path)
+            # 类名与形态学分类只取决于模型的类别表，加载时算一次，推理时按 id 直接查表
+            self._class_info = {
+                cls_id: (name, CLASS_NAME_TO_MORPHOLOGY.get(name.lower(), cls_id))
+                for cls_id, name in self.model.names.items()
+            }
             
             # 显式将模型移动到目标设备（GPU），实现预加载
             if torch.cuda.is_available() and str(self.device).startswith('cuda'):
@@ -184,6 +196,7 @@ class JointPredictor:
                     _ = self.model.predict(
                         source=dummy_image,
                         device=self.device,
+                        half=self.half,
                         verbose=False,
                         conf=0.25,
                         iou=0.45
@@ -200,6 +213,20 @@ class JointPredictor:
             self.model = None
             raise
 
+    def _box_feature(self, row: np.ndarray) -> dict:
+        """由一行 [x1, y1, x2, y2, conf, cls] 构造单个框的特征 dict"""
+        bbox = row[:4].tolist()  # [x1, y1, x2, y2]
+        conf = float(row[-2])
+        cls_id = int(row[-1])
+        # 形态学分类 (morphology) 优先使用类名映射，如果找不到则使用原始class_id
+        cls_name, morphology = self._class_info.get(cls_id, (f"Class_{cls_id}", cls_id))
+        return {
+            "bbox": bbox,
+            "class_name": cls_name,
+            "confidence": conf,
+            "class_id": morphology  # 使用形态学分类 (0=正常, 1=吸收, 2=疑似)
+        }
+
     def predict(self, image) -> dict:
         """
         执行推理
@@ -219,6 +246,7 @@ class JointPredictor:
                 results = self.model.predict(
                     source=image,
                     device=self.device,
+                    half=self.half,
                     verbose=False,
                     conf=0.25,
                     iou=0.45
@@ -228,7 +256,7 @@ class JointPredictor:
             # 结果解析（Post-processing）
             with timer.record("condyle_det.post"):
                 # 解析 YOLO 结果 (Box, Class, Confidence)
-                all_raw_features = []
+                detected_count = 0
 
                 best_left_feature = {}
                 best_right_feature = {}
@@ -240,43 +268,28 @@ class JointPredictor:
                 image_center_x = image_width / 2
 
                 if result.boxes:
-                    for box in result.boxes:
-                        # 转为标准 Python 数据类型
-                        bbox = box.xyxy.cpu().numpy()[0].tolist()  # [x1, y1, x2, y2]
-                        conf = float(box.conf.cpu().numpy()[0])
-                        cls_id = int(box.cls.cpu().numpy()[0])
-                        cls_name = result.names.get(cls_id, f"Class_{cls_id}")
-
-                        # 计算BBox中心点的x坐标
-                        bbox_center_x = (bbox[0] + bbox[2]) / 2
-
-                        # 从类名推导形态学分类 (morphology)
-                        # 优先使用类名映射，如果找不到则使用原始class_id
-                        morphology = CLASS_NAME_TO_MORPHOLOGY.get(cls_name.lower(), cls_id)
-
-                        feature_data = {
-                            "bbox": bbox,
-                            "class_name": cls_name,
-                            "confidence": conf,
-                            "class_id": morphology  # 使用形态学分类 (0=正常, 1=吸收, 2=疑似)
-                        }
-
-                        all_raw_features.append(feature_data)
-
-                        # --- 根据BBox位置判断左右侧 (左半部分=左侧，右半部分=右侧) ---
-                        if bbox_center_x < image_center_x:
-                            # 左侧髁突
-                            if conf > max_conf_left:
-                                max_conf_left = conf
-                                best_left_feature = feature_data
-                        else:
-                            # 右侧髁突
-                            if conf > max_conf_right:
-                                max_conf_right = conf
-                                best_right_feature = feature_data
-                        # ------------------------------------
-
-                logger.info(f"Inference done. Detected {len(all_raw_features)} objects.")
+                    # boxes.data 每行为 [x1, y1, x2, y2, conf, cls]，整体一次拷回 CPU；
+                    # 转 float64 后与逐个转为 Python float 的数值一致
+                    data = result.boxes.data.cpu().numpy().astype(np.float64)
+                    detected_count = len(data)
+                    confs = data[:, -2]
+
+                    # --- 根据BBox中心x坐标判断左右侧 (左半部分=左侧，右半部分=右侧)，各侧取置信度最高的框 ---
+                    # 另一侧的框置为 -1，argmax 在并列时取第一个，与逐框比较 conf > max_conf 的结果一致
+                    is_left = (data[:, 0] + data[:, 2]) / 2 < image_center_x
+                    left_scores = np.where(is_left, confs, -1.0)
+                    right_scores = np.where(is_left, -1.0, confs)
+                    li = int(left_scores.argmax())
+                    ri = int(right_scores.argmax())
+                    if left_scores[li] >= 0:
+                        max_conf_left = float(left_scores[li])
+                        best_left_feature = self._box_feature(data[li])
+                    if right_scores[ri] >= 0:
+                        max_conf_right = float(right_scores[ri])
+                        best_right_feature = self._box_feature(data[ri])
+                    # ------------------------------------
+
+                logger.info(f"Inference done. Detected {detected_count} objects.")
                 logger.info(f"Image dimensions: {result.orig_shape}, center_x: {image_center_x}")
                 logger.info(f"Left feature selected: {bool(best_left_feature)} (conf: {max_conf_left if best_left_feature else 'N/A'})")
                 logger.info(f"Right feature selected: {bool(best_right_feature)} (conf: {max_conf_right if best_right_feature else 'N/A'})")
@@ -284,7 +297,7 @@ class JointPredictor:
                 # 准备分析元数据 (此处只模拟)
                 analysis = {
                     "model_type": "yolov11",
-                    "detected_count": len(all_raw_features),
+                    "detected_count": detected_count,
                     "image_shape": result.orig_shape,  # (Height, Width)
                     "is_symmetric": True,  # 默认为True，除非有其他模块计算
                     "metrics": {},
@@ -10,7 +10,6 @@ import sys
 import logging
 import numpy as np
 import onnxruntime as ort
-import torch
 import json
 import time
 from typing import Optional, List
@@ -26,7 +25,7 @@ if project_root not in sys.path:
     sys.path.append(project_root)
 
 # 导入统一的权重获取工具
-from tools.weight_fetcher import ensure_weight_file, WeightFetchError
+from tools.weight_fetcher import ensure_weight_file, WeightFetchError, LOCAL_WEIGHTS_DIR
 from tools.timer import timer
 
 # 引用前处理 (负责算数)
@@ -89,6 +88,7 @@ class JointPredictor:
         weights_key: Optional[str] = None,
         weights_force_download: bool = False,
         input_size: Optional[List[int]] = None,
+        use_tensorrt: bool = False,
     ):
         """
         初始化髁突分割模块
@@ -97,12 +97,26 @@ class JointPredictor:
             weights_key: S3 权重路径（从 config.yaml 传入）
             weights_force_download: 是否强制重新下载权重
             input_size: 输入尺寸 [H, W]，默认 [224, 224]
+            use_tensorrt: 是否优先使用 TensorRT 执行器（FP16，engine 缓存在权重缓存目录下）
         """
         self.weights_key = weights_key
         self.weights_force_download = weights_force_download
         
         # 兼容 ONNX Runtime 的执行器
         self.providers = ['CUDAExecutionProvider', 'CPUExecutionProvider']
+        if use_tensorrt and 'TensorrtExecutionProvider' not in ort.get_available_providers():
+            logger.warning("use_tensorrt is enabled but TensorrtExecutionProvider is unavailable, falling back to CUDA/CPU")
+        elif use_tensorrt:
+            # 输入尺寸固定，TensorRT engine 首次构建后持久化，后续启动直接加载；
+            # FP16 精度影响需验证，因此默认关闭，由 config.yaml 显式开启
+            trt_cache_dir = LOCAL_WEIGHTS_DIR / '.trt_cache'
+            trt_cache_dir.mkdir(parents=True, exist_ok=True)
+            self.providers.insert(0, ('TensorrtExecutionProvider', {
+                'trt_fp16_enable': True,
+                'trt_engine_cache_enable': True,
+                'trt_engine_cache_path': str(trt_cache_dir),
+                'trt_max_workspace_size': 1 << 30,
+            }))
         
         # 输入尺寸
         if input_size:
@@ -198,12 +212,8 @@ class JointPredictor:
 
             # 2. ONNX 推理 (Inference)
             with timer.record("condyle_seg.inference"):
-                # 将 PyTorch tensor 转换为 numpy (ONNX Runtime 需要 numpy)
-                input_numpy = input_tensor.cpu().numpy()
-                logger.info(f"[predict] Running ONNX inference with input shape: {input_numpy.shape}")
-                
-                # 执行推理
-                onnx_outputs = self.session.run(None, {self.input_name: input_numpy})
+                # 前处理已输出连续的 float32 numpy 数组，直接送入 ONNX Runtime
+                onnx_outputs = self.session.run(None, {self.input_name: input_tensor})
                 logger.info(f"[predict] ONNX output count: {len(onnx_outputs)}, first output shape: {onnx_outputs[0].shape}")
 
             # 3. 后处理 (Post-processing)
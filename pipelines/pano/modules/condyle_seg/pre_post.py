@@ -13,13 +13,15 @@ class JointPrePostProcessor:
         self.CLASS_ID_LEFT = 1
         self.CLASS_ID_RIGHT = 2
 
-    def preprocess(self, image: np.ndarray) -> torch.Tensor:
-        """图像预处理 (保持不变)"""
+    def preprocess(self, image: np.ndarray) -> np.ndarray:
+        """图像预处理：返回 (1, 3, H, W) 连续 float32 数组，可直接作为 ONNX Runtime 输入"""
         self.orig_h, self.orig_w = image.shape[:2]
         img_resized = cv2.resize(image, self.input_size)
-        img_float = img_resized.astype(np.float32) / 255.0
-        img_chw = img_float.transpose(2, 0, 1)
-        return torch.from_numpy(img_chw).unsqueeze(0)
+        # 每次调用单独分配输出：实例在线程池 worker 间共享，复用缓冲区会被并发请求覆盖；
+        # 归一化与 HWC->NCHW 转置在一次 float32 除法中完成，结果与 astype(float32) / 255.0 逐位一致
+        blob = np.empty((1, 3) + img_resized.shape[:2], dtype=np.float32)
+        np.divide(img_resized.transpose(2, 0, 1), np.float32(255.0), out=blob[0], dtype=np.float32)
+        return blob
 
     def postprocess(self, model_output) -> dict:
         """
@@ -33,11 +35,13 @@ class JointPrePostProcessor:
 
         # 2. 还原尺寸
         final_mask = self._resize_mask_to_original(pred_mask)
-        logger.info(f"[CondyleSeg] final_mask shape: {final_mask.shape}, unique values: {np.unique(final_mask)}")
+        # 一次 bincount 遍历整张 mask，得到各标签像素数（即左右面积），替代逐类求和与 np.unique 的排序
+        counts = np.bincount(final_mask.ravel(), minlength=max(self.CLASS_ID_LEFT, self.CLASS_ID_RIGHT) + 1)
+        logger.info(f"[CondyleSeg] final_mask shape: {final_mask.shape}, unique values: {np.flatnonzero(counts)}")
 
         # 3. 提取特征 (现在 final_mask 里有 1 和 2 了，所以能提取到了)
-        left_feats = self._extract_features(final_mask, self.CLASS_ID_LEFT)
-        right_feats = self._extract_features(final_mask, self.CLASS_ID_RIGHT)
+        left_feats = self._extract_features(final_mask, self.CLASS_ID_LEFT, int(counts[self.CLASS_ID_LEFT]))
+        right_feats = self._extract_features(final_mask, self.CLASS_ID_RIGHT, int(counts[self.CLASS_ID_RIGHT]))
 
         logger.info(
             f"[CondyleSeg] Left exists: {left_feats['exists']}, contour points: {len(left_feats.get('contour', []))}")
@@ -65,24 +69,30 @@ class JointPrePostProcessor:
 
         # --- A. 获取纯净的二值 Mask (0/1) ---
         binary_mask = None
+        # 4 维输出的各分支直接得到 0/1 uint8，无需再二值化拷贝一次
+        is_binary_uint8 = False
 
         if isinstance(model_output, torch.Tensor):
             # 处理 Tensor (1, C, H, W)
             if model_output.ndim == 4:
+                # 在设备上归约并转为 uint8 后再拷回 CPU，拷贝量只有 H*W 字节
                 if model_output.shape[1] == 2:  # Argmax
-                    binary_mask = torch.argmax(model_output, dim=1).squeeze(0).cpu().numpy()
+                    binary_mask = torch.argmax(model_output, dim=1).squeeze(0).to(torch.uint8).cpu().numpy()
                 else:  # Sigmoid
-                    binary_mask = (model_output > 0.5).int().squeeze(0).cpu().numpy()
+                    binary_mask = (model_output > 0.5).to(torch.uint8).squeeze(0).cpu().numpy()
+                is_binary_uint8 = True
             elif model_output.ndim == 3:
-                binary_mask = torch.argmax(model_output, dim=0).cpu().numpy()
+                binary_mask = torch.argmax(model_output, dim=0).to(torch.uint8).cpu().numpy()
 
         elif isinstance(model_output, np.ndarray):
             # 处理 Numpy (ONNX输出)
             if model_output.ndim == 4:
                 if model_output.shape[1] == 2:
-                    binary_mask = np.argmax(model_output, axis=1)[0]
+                    # 两通道 argmax 等价于逐像素比较（相等时取背景 0），不生成 int64 下标数组
+                    binary_mask = (model_output[0, 1] > model_output[0, 0]).view(np.uint8)
                 else:
                     binary_mask = (model_output[0, 0] > 0.5).astype(np.uint8)
+                is_binary_uint8 = True
             elif model_output.ndim == 3:
                 binary_mask = np.argmax(model_output, axis=0) if model_output.shape[0] > 1 else (
                             model_output[0] > 0.5).astype(np.uint8)
@@ -95,7 +105,8 @@ class JointPrePostProcessor:
             return np.zeros(self.input_size, dtype=np.uint8)
 
         # 确保是 0/1 二值图
-        binary_mask = (binary_mask > 0).astype(np.uint8)
+        if not is_binary_uint8:
+            binary_mask = (binary_mask > 0).astype(np.uint8)
 
         # --- B. 执行左右分离 (连通域分析) ---
         # 如果模型已经是多分类的(比如已经有2了)，就不处理
@@ -130,22 +141,22 @@ class JointPrePostProcessor:
 
     def _resize_mask_to_original(self, mask):
         """(保持不变) 使用最近邻插值，防止 ID 1 和 2 混合变成 1.5"""
-        mask = mask.astype(np.uint8)
+        # _parse_output_to_mask 已输出 uint8，这里不再无谓复制
+        mask = mask.astype(np.uint8, copy=False)
         return cv2.resize(mask, (int(self.orig_w), int(self.orig_h)), interpolation=cv2.INTER_NEAREST)
 
-    def _extract_features(self, mask, class_id):
-        """(保持不变) 根据 class_id 提取特征"""
+    def _extract_features(self, mask, class_id, area):
+        """根据 class_id 提取特征；area 为该标签的像素数（由 postprocess 的 bincount 给出）"""
         logger = logging.getLogger(__name__)
 
-        # 这里 mask == class_id 会分别取到 1 和 2
-        binary_mask = (mask == class_id).astype(np.uint8)
-        area = np.sum(binary_mask)
-
         if area == 0:
             return {
                 "area": 0, "exists": False, "confidence": 0.0, "contour": [], "mask": None
             }
 
+        # 这里 mask == class_id 会分别取到 1 和 2；bool 结果按 uint8 视图使用，不再拷贝一份
+        binary_mask = (mask == class_id).view(np.uint8)
+
         # 提取轮廓
         contours, _ = cv2.findContours(binary_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
 
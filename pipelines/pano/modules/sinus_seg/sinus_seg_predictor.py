@@ -7,7 +7,7 @@ import numpy as np
 import onnxruntime as ort
 
 sys.path.append(os.getcwd())
-from tools.weight_fetcher import get_s3_client, S3_BUCKET_NAME, LOCAL_WEIGHTS_DIR
+from tools.weight_fetcher import ensure_weight_file
 # ▼▼▼ 1. 导入刚才写的 PrePostProcessor ▼▼▼
 from pipelines.pano.modules.sinus_seg.pre_post import SinusPrePostProcessor
 
@@ -42,19 +42,12 @@ class SinusSegPredictor:
         self._init_session()
 
     def _download_if_needed(self, s3_key):
-        # ... (保持原样) ...
-        local_path = os.path.join(LOCAL_WEIGHTS_DIR, s3_key)
-        local_dir = os.path.dirname(local_path)
-        if not os.path.exists(local_dir): os.makedirs(local_dir)
-        if not os.path.exists(local_path):
-            logger.info(f"Downloading Seg model: {s3_key} ...")
-            try:
-                s3 = get_s3_client()
-                if s3: s3.download_file(S3_BUCKET_NAME, s3_key, local_path)
-            except Exception as e:
-                logger.error(f"Download failed: {e}")
-                return None
-        return local_path
+        # 统一走 ensure_weight_file：命中本地缓存直接返回，需要下载时带跨进程文件锁
+        try:
+            return ensure_weight_file(s3_key)
+        except Exception as e:
+            logger.error(f"Download failed: {e}")
+            return None
 
     def _init_session(self):
         # ... (保持原样) ...
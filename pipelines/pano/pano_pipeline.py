@@ -165,12 +165,21 @@ class PanoPipeline(BasePipeline):
             # ================= 核心推理流程 =================
 
             # 1. 骨骼结构 (新版逻辑)
-            condyle_seg_res = self._run_condyle_seg_v2(image_path)  # 髁突左右分离
-            sinus_res = self._run_sinus_workflow_v2(image_path, pixel_spacing)  # 上颌窦修复版
-            neural_res = self._run_neural_seg(image_path)  # ▼▼▼ 神经管 ▼▼▼
+            # 以下模块均使用 BGR 数组且不修改输入，只解码一次后共享；
+            # 髁突检测传数组而非路径，YOLO 内部也不再重复 imread（同为 BGR，结果一致）
+            image_bgr = cv2.imread(image_path)
+            if image_bgr is None:
+                # cv2 无法解码时这些模块全部跳过；不能把 None 传给 YOLO，
+                # ultralytics 会把 source=None 替换为内置示例图并返回其检测结果
+                logger.error(f"cv2 failed to decode image, skipping BGR modules: {image_path}")
+                condyle_seg_res, sinus_res, neural_res, mandible_res, condyle_det_res = {}, {}, {}, {}, {}
+            else:
+                condyle_seg_res = self._run_condyle_seg_v2(image_bgr)  # 髁突左右分离
+                sinus_res = self._run_sinus_workflow_v2(image_bgr, pixel_spacing)  # 上颌窦修复版
+                neural_res = self._run_neural_seg(image_bgr)  # ▼▼▼ 神经管 ▼▼▼
 
-            mandible_res = self._safe_run_module_cv2(self.modules.get('mandible'), 'predict', image_path)
-            condyle_det_res = self._safe_run_module(self.modules.get('condyle_det'), 'predict', image_path)
+                mandible_res = self._safe_run_module(self.modules.get('mandible'), 'predict', image_bgr)
+                condyle_det_res = self._safe_run_module(self.modules.get('condyle_det'), 'predict', image_bgr)
 
             # 2. 牙齿与种植体
             implant_res = self._safe_run_module_pil(self.modules.get('implant_detect'), 'predict', image_path)
@@ -259,13 +268,12 @@ class PanoPipeline(BasePipeline):
     # -------------------------------------------------------------------------
     # 神经管分割 (新)
     # -------------------------------------------------------------------------
-    def _run_neural_seg(self, image_path: str) -> dict:
+    def _run_neural_seg(self, image: np.ndarray) -> dict:
         self._log_step("神经管分割", "ONNX + 左右分离")
         try:
             if 'neural_seg' not in self.modules:
                 return {}
 
-            image = cv2.imread(image_path)
             if image is None: return {}
 
             predictor = self.modules['neural_seg']
@@ -288,7 +296,7 @@ class PanoPipeline(BasePipeline):
     # -------------------------------------------------------------------------
     # 髁突分割 (V2)
     # -------------------------------------------------------------------------
-    def _run_condyle_seg_v2(self, image_path: str) -> dict:
+    def _run_condyle_seg_v2(self, image: np.ndarray) -> dict:
         self._log_step("髁突分割", "v2: 左右分离")
         try:
             if 'condyle_seg' not in self.modules: return {}
@@ -296,7 +304,6 @@ class PanoPipeline(BasePipeline):
             # 动态导入防止循环引用
             from pipelines.pano.modules.condyle_seg.pre_post import JointPrePostProcessor
 
-            image = cv2.imread(image_path)
             if image is None: return {}
 
             predictor = self.modules['condyle_seg']
@@ -309,7 +316,7 @@ class PanoPipeline(BasePipeline):
             if not predictor.session: return {}
 
             input_name = predictor.session.get_inputs()[0].name
-            raw_out = predictor.session.run(None, {input_name: input_tensor.numpy()})
+            raw_out = predictor.session.run(None, {input_name: input_tensor})
 
             final_result = pre_post.postprocess(raw_out[0])
 
@@ -328,12 +335,11 @@ class PanoPipeline(BasePipeline):
     # -------------------------------------------------------------------------
     # 上颌窦工作流 (V2 修复版)
     # -------------------------------------------------------------------------
-    def _run_sinus_workflow_v2(self, image_path, pixel_spacing):
+    def _run_sinus_workflow_v2(self, image, pixel_spacing):
         self._log_step("上颌窦分析", "v2: 轮廓修复版")
         try:
             if 'sinus_seg' not in self.modules or 'sinus_class' not in self.modules: return {}
 
-            image = cv2.imread(image_path)
             if image is None: return {}
 
             seg_predictor = self.modules['sinus_seg']
@@ -432,13 +438,6 @@ class PanoPipeline(BasePipeline):
             return {}
         return {}
 
-    def _safe_run_module_cv2(self, module, func, path):
-        try:
-            if module: return getattr(module, func)(cv2.imread(path))
-        except:
-            return {}
-        return {}
-
     def _safe_run_module_pil(self, module, func, path):
         try:
             if module:
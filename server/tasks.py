@@ -8,7 +8,7 @@ v3: 使用真实 Pipeline，移除 mock 数据
 import logging
 import os
 from datetime import datetime, timezone
-from typing import Any, Dict, Type
+from typing import Any, Dict, List, Type
 
 from server.worker import celery_app
 from server.core.persistence import TaskPersistence
@@ -22,6 +22,7 @@ from pipelines.dental_age.dental_age_pipeline import DentalAgePipeline  # v4 新
 
 # Timer 配置初始化
 from tools.timer import configure_from_config
+from tools.weight_fetcher import prefetch_weight_files
 
 logger = logging.getLogger(__name__)
 
@@ -57,6 +58,33 @@ def _extract_init_kwargs(settings: Dict[str, Any]) -> Dict[str, Any]:
     return {}
 
 
+def _collect_prefetch_keys(pipeline_config: Dict[str, Any]) -> List[str]:
+    """
+    收集需要预加载的 Pipeline 中各模块配置的 S3 权重 key
+
+    跳过本地已存在的路径（模块会直接使用）以及配置了强制重新下载的模块（模块初始化时仍会下载）。
+    """
+    keys: List[str] = []
+    for task_type in _PIPELINE_BUILDERS:
+        settings = pipeline_config.get(task_type, {})
+        if not isinstance(settings, dict) or not settings.get('preload', True):
+            continue
+        modules = settings.get('modules')
+        if not isinstance(modules, dict):
+            continue
+        for module_config in modules.values():
+            if not isinstance(module_config, dict):
+                continue
+            weights_key = module_config.get('weights_key')
+            if (
+                weights_key
+                and not module_config.get('weights_force_download', False)
+                and not os.path.exists(weights_key)
+            ):
+                keys.append(weights_key)
+    return keys
+
+
 def _preload_pipelines() -> None:
     global _PIPELINE_SETTINGS, _PIPELINES_INITIALIZED
     if _PIPELINES_INITIALIZED:
@@ -70,6 +98,9 @@ def _preload_pipelines() -> None:
     pipeline_config = config.get('pipelines', {})
     _PIPELINE_SETTINGS = pipeline_config
 
+    # 先并发拉取所有预加载模块的权重，避免各模块初始化时逐个串行下载
+    prefetch_weight_files(_collect_prefetch_keys(pipeline_config))
+
     for task_type, builder in _PIPELINE_BUILDERS.items():
         settings = pipeline_config.get(task_type, {})
         should_preload = settings.get('preload', True) if isinstance(settings, dict) else True
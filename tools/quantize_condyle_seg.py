@@ -0,0 +1,76 @@
+"""
+髁突分割 ONNX 模型的离线 int8 静态量化。
+
+使用方法（在项目根目录运行）：
+python tools/quantize_condyle_seg.py <fp32.onnx> <int8.onnx> <校准图片目录> [--limit 50]
+
+校准图片使用真实全景片，经与线上一致的 JointPrePostProcessor.preprocess 处理。
+量化结果需先在验证集上确认 Dice 在容差内，再上传到 S3 并修改 config.yaml 中
+condyle_seg 的 weights_key；本脚本不改动线上权重。
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import cv2
+import numpy as np
+from onnxruntime.quantization import CalibrationDataReader, QuantFormat, QuantType, quantize_static
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from pipelines.pano.modules.condyle_seg.pre_post import JointPrePostProcessor
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png"}
+
+
+class CondyleCalibrationReader(CalibrationDataReader):
+    """逐张读取校准图片，输出与线上推理相同的 (1, 3, H, W) float32 输入。"""
+
+    def __init__(self, image_paths: List[Path], input_name: str, input_size=(224, 224)):
+        self.input_name = input_name
+        self.pre_post = JointPrePostProcessor(input_size=input_size)
+        self._paths: Iterator[Path] = iter(image_paths)
+
+    def get_next(self) -> Optional[Dict[str, np.ndarray]]:
+        for path in self._paths:
+            image = cv2.imread(str(path))
+            if image is None:
+                print(f"无法读取，跳过: {path}")
+                continue
+            return {self.input_name: self.pre_post.preprocess(image)}
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="髁突分割 ONNX 模型 int8 静态量化")
+    parser.add_argument("model", type=Path, help="FP32 ONNX 模型路径")
+    parser.add_argument("output", type=Path, help="量化后模型输出路径")
+    parser.add_argument("calib_dir", type=Path, help="校准图片目录")
+    parser.add_argument("--limit", type=int, default=50, help="最多使用的校准图片数")
+    args = parser.parse_args()
+
+    image_paths = sorted(p for p in args.calib_dir.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)[:args.limit]
+    if not image_paths:
+        raise SystemExit(f"校准目录中没有图片: {args.calib_dir}")
+
+    import onnxruntime as ort
+    input_name = ort.InferenceSession(str(args.model), providers=["CPUExecutionProvider"]).get_inputs()[0].name
+
+    quantize_static(
+        str(args.model),
+        str(args.output),
+        CondyleCalibrationReader(image_paths, input_name),
+        quant_format=QuantFormat.QDQ,
+        per_channel=True,
+        activation_type=QuantType.QInt8,
+        weight_type=QuantType.QInt8,
+    )
+    print(f"已使用 {len(image_paths)} 张图片完成校准，量化模型: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
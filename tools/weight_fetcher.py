@@ -9,9 +9,12 @@ S3 权重获取工具
 
 from __future__ import annotations
 
+import logging
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, Iterator, Optional
 
 import boto3
 from botocore.exceptions import (
@@ -33,6 +36,11 @@ except ImportError:
     Timeout = None
     RequestException = None
 
+try:
+    import fcntl  # 仅 POSIX 可用：用于多进程下载同一权重时加文件锁
+except ImportError:  # pragma: no cover - Windows 上没有 fcntl
+    fcntl = None  # type: ignore
+
 try:
     import torch  # 可选：供 load_state_dict_from_s3 使用
 except Exception:  # pragma: no cover - 某些环境可能没有 torch
@@ -45,6 +53,8 @@ S3_BUCKET_NAME = os.getenv('S3_BUCKET_NAME', 'teeth')
 
 LOCAL_WEIGHTS_DIR = Path(os.getenv('WEIGHTS_CACHE_DIR', './cached_weights'))
 
+logger = logging.getLogger(__name__)
+
 
 class WeightFetchError(RuntimeError):
     """抛出权重下载或加载失败时的错误。"""
@@ -66,13 +76,88 @@ def _normalize_key(relative_path: str) -> str:
     return relative_path.lstrip('/').replace('\\', '/')
 
 
-def ensure_weight_file(s3_relative_path: str, *, force_download: bool = False) -> str:
+@contextmanager
+def _download_lock(local_path: Path) -> Iterator[None]:
+    """同一权重文件的下载在多进程间互斥；没有 fcntl 的平台（Windows 开发环境）不加锁。
+
+    锁文件 '<file>.lock' 有意保留在缓存目录中、不在释放后删除：删除后其他进程可能锁住
+    已被 unlink 的旧 inode，而新来的进程锁住新建的文件，两者同时下载，互斥失效。
+    锁文件为空且每个权重只有一个，占用可忽略。
+    """
+    if fcntl is None:
+        yield
+        return
+    lock_path = local_path.with_name(local_path.name + '.lock')
+    with open(lock_path, 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _download_weight(sanitized_key: str, local_path: Path, client=None) -> None:
+    """从 S3 下载单个权重文件到 local_path，连接/下载错误统一转换为 WeightFetchError。
+
+    client 未给定时新建一个；并发下载时应由调用方传入同一个 client。
+    """
+    if client is None:
+        client = get_s3_client()
+    try:
+        client.download_file(S3_BUCKET_NAME, sanitized_key, str(local_path))
+    except (ClientError, BotoCoreError, EndpointConnectionError, ConnectionClosedError, 
+            NoCredentialsError, PartialCredentialsError) as exc:
+        # 捕获所有 boto3/botocore 相关的连接和下载错误
+        error_code = None
+        if isinstance(exc, ClientError):
+            error_code = exc.response.get('Error', {}).get('Code')
+
+        message = (
+            f"S3 download failed (bucket={S3_BUCKET_NAME}, key={sanitized_key}"
+            + (f", code={error_code}" if error_code else "")
+            + f"): {exc}"
+        )
+        raise WeightFetchError(message) from exc
+    except Exception as exc:
+        # 捕获底层网络库的异常（requests, urllib3 等）
+        # 检查异常类型而不是错误消息，避免误判
+        exc_type = type(exc).__name__
+        exc_module = type(exc).__module__
+
+        # 检查是否是网络/连接相关的异常
+        is_network_error = (
+            # requests 异常
+            (RequestsConnectionError and isinstance(exc, RequestsConnectionError)) or
+            (Timeout and isinstance(exc, Timeout)) or
+            (RequestException and isinstance(exc, RequestException)) or
+            # urllib3 异常
+            'urllib3' in exc_module or
+            'urllib' in exc_module or
+            # socket 异常
+            'socket' in exc_module or
+            # 其他常见的网络异常类型
+            'Connection' in exc_type or
+            'Timeout' in exc_type or
+            'Network' in exc_type
+        )
+
+        if is_network_error:
+            message = (
+                f"S3 download failed (bucket={S3_BUCKET_NAME}, key={sanitized_key}): {exc}"
+            )
+            raise WeightFetchError(message) from exc
+        # 其他未知错误直接抛出（可能是代码逻辑错误等）
+        raise
+
+
+def ensure_weight_file(s3_relative_path: str, *, force_download: bool = False, client=None) -> str:
     """
     确保指定 S3 key 的权重文件已缓存到本地。
 
     Args:
         s3_relative_path: S3 中的 Key（不含 bucket），例如 'weights/ceph/model.pt'
         force_download: 是否忽略本地缓存重新下载
+        client: 可选的 S3 客户端（多线程并发调用时传入共享的 client）
 
     Returns:
         str: 本地文件的绝对路径，可直接传给模型加载接口
@@ -80,59 +165,74 @@ def ensure_weight_file(s3_relative_path: str, *, force_download: bool = False) -
 
     sanitized_key = _normalize_key(s3_relative_path)
     local_path = LOCAL_WEIGHTS_DIR / sanitized_key
-    local_path.parent.mkdir(parents=True, exist_ok=True)
 
     if not local_path.exists() or force_download:
-        client = get_s3_client()
-        try:
-            client.download_file(S3_BUCKET_NAME, sanitized_key, str(local_path))
-        except (ClientError, BotoCoreError, EndpointConnectionError, ConnectionClosedError, 
-                NoCredentialsError, PartialCredentialsError) as exc:
-            # 捕获所有 boto3/botocore 相关的连接和下载错误
-            error_code = None
-            if isinstance(exc, ClientError):
-                error_code = exc.response.get('Error', {}).get('Code')
-            
-            message = (
-                f"S3 download failed (bucket={S3_BUCKET_NAME}, key={sanitized_key}"
-                + (f", code={error_code}" if error_code else "")
-                + f"): {exc}"
-            )
-            raise WeightFetchError(message) from exc
-        except Exception as exc:
-            # 捕获底层网络库的异常（requests, urllib3 等）
-            # 检查异常类型而不是错误消息，避免误判
-            exc_type = type(exc).__name__
-            exc_module = type(exc).__module__
-            
-            # 检查是否是网络/连接相关的异常
-            is_network_error = (
-                # requests 异常
-                (RequestsConnectionError and isinstance(exc, RequestsConnectionError)) or
-                (Timeout and isinstance(exc, Timeout)) or
-                (RequestException and isinstance(exc, RequestException)) or
-                # urllib3 异常
-                'urllib3' in exc_module or
-                'urllib' in exc_module or
-                # socket 异常
-                'socket' in exc_module or
-                # 其他常见的网络异常类型
-                'Connection' in exc_type or
-                'Timeout' in exc_type or
-                'Network' in exc_type
-            )
-            
-            if is_network_error:
-                message = (
-                    f"S3 download failed (bucket={S3_BUCKET_NAME}, key={sanitized_key}): {exc}"
-                )
-                raise WeightFetchError(message) from exc
-            # 其他未知错误直接抛出（可能是代码逻辑错误等）
-            raise
+        # 只有需要下载时才创建缓存目录；命中本地缓存时目录必然已存在
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        with _download_lock(local_path):
+            # 拿到锁后再检查一次：多个 worker 同时冷启动时，只有第一个真正下载
+            if force_download or not local_path.exists():
+                _download_weight(sanitized_key, local_path, client)
 
     return str(local_path.resolve())
 
 
+def _advise_willneed(local_path: str) -> None:
+    """提示内核异步预读整个权重文件到页缓存；不支持 posix_fadvise 的平台直接跳过。"""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    fd = os.open(local_path, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    finally:
+        os.close(fd)
+
+
+def prefetch_weight_files(s3_relative_paths: Iterable[str], *, max_workers: int = 8) -> Dict[str, str]:
+    """
+    并发确保多个权重文件已缓存到本地，供 Worker 冷启动时在构建 Pipeline 前调用。
+
+    每个 key 仍走 ensure_weight_file（缓存检查 + 文件锁）。单个文件失败只记录日志，
+    由对应模块初始化时按原有逻辑处理（再次尝试下载或进入 mock 模式）。
+    已缓存的文件会提示内核预读，随后各模块串行加载权重时直接命中页缓存。
+
+    Args:
+        s3_relative_paths: S3 Key 列表，重复项只下载一次
+        max_workers: 最大并发下载数
+
+    Returns:
+        Dict[str, str]: 成功缓存的 key -> 本地绝对路径
+    """
+    keys = list(dict.fromkeys(key for key in s3_relative_paths if key))
+    resolved: Dict[str, str] = {}
+    if not keys:
+        return resolved
+
+    # boto3 默认 session 并发创建 client 不是线程安全的；底层 client 本身线程安全，
+    # 因此在启动线程池前创建一个，所有下载线程共享
+    try:
+        client = get_s3_client()
+    except Exception as exc:
+        logger.warning(f"Weight prefetch skipped, failed to create S3 client: {exc}")
+        return resolved
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(keys))) as executor:
+        futures = {executor.submit(ensure_weight_file, key, client=client): key for key in keys}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                resolved[key] = future.result()
+            except Exception as exc:
+                logger.warning(f"Weight prefetch failed for '{key}': {exc}")
+                continue
+            # 预读提示失败不影响已缓存的文件，只记 debug
+            try:
+                _advise_willneed(resolved[key])
+            except OSError as exc:
+                logger.debug(f"Read-ahead hint failed for '{resolved[key]}': {exc}")
+    return resolved
+
+
 def load_state_dict_from_s3(
     s3_relative_path: str,
     *,
@@ -155,6 +255,7 @@ def load_state_dict_from_s3(
 __all__ = [
     "WeightFetchError",
     "ensure_weight_file",
+    "prefetch_weight_files",
     "load_state_dict_from_s3",
     "get_s3_client",
     "S3_BUCKET_NAME",